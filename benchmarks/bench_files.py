@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.files import File  # noqa: E402
+from core.bindings import Binding  # noqa: E402
+
+SIZES = (500, 2000, 10000, 30000)  # Lines of the generated files
+REPEATS = 3                          # Best of REPEATS is reported
+OPERATIONS = 100                     # Lookups / edits per timed case
+
+
+def generate_input_ini(lines: int, rng: random.Random) -> str:
+    """DefaultInput.ini-like file: a few sections, mostly .Bindings=( lines and some settings."""
+    out = []
+    section = 0
+    while len(out) < lines:
+        out.append(f"[Engine.PlayerInput{section}]")
+        for i in range(min(500, lines - len(out))):
+            n = len(out)
+            if rng.random() < 0.8:
+                out.append(f'.Bindings=(Name="Key{n}",Command="Command {n} | OnRelease Other{n % 97}")')
+            else:
+                out.append(f"{';' if rng.random() < 0.1 else ''}Setting{n}={rng.randint(0, 1000)}")
+        out.append("")
+        section += 1
+    return "\n".join(out[:lines]) + "\n"
+
+
+def generate_game_ini(lines: int, rng: random.Random) -> str:
+    """DefaultGame.ini-like file: key=value settings in many sections."""
+    out = []
+    while len(out) < lines:
+        out.append(f"[OLGame.Class{len(out)}]")
+        for _ in range(min(rng.randint(5, 40), lines - len(out))):
+            out.append(f"Key{len(out)}={rng.random():.6f}")
+        out.append("")
+    return "\n".join(out[:lines]) + "\n"
+
+
+def fresh_file(path: str) -> File:
+    """A File object that has never read `path`, as on a fresh start of the launcher."""
+    File.instances.clear()
+    File.files.clear()
+    File.pending.clear()
+    return File(path)
+
+
+def cases(input_path: str, game_path: str, lines: int):
+    """Yield (name, setup, operation) for the timed cases; setup's result is passed to operation."""
+    ops = min(OPERATIONS, lines // 5)
+    commands = [f"Command {n} | OnRelease Other{n % 97}" for n in range(1, lines, max(1, lines // ops))][:ops]
+    keys = [f"Key{n}" for n in range(2, lines, max(1, lines // ops))][:ops]
+
+    def loaded(path):
+        def setup():
+            file = fresh_file(path)
+            file.index  # Read and index outside of the timed part
+            return file
+        return setup
+
+    def bindings(path):
+        """Bindings of the sampled commands on a loaded file, as the bindings window has them."""
+        def setup():
+            Binding.file = loaded(path)()
+            Binding.bindings.clear()
+            for command in commands:
+                Binding(command, command).key = "F1"
+            return Binding
+        return setup
+
+    def load(file):
+        file.get_line("Setting")
+
+    def get_line(file):
+        for key in keys:
+            file.get_line(key + "=")
+
+    def get_key(file):
+        for key in keys:
+            file.get_key(key)
+
+    def replace_or_add(file):
+        for key in keys:
+            file.replace_or_add(f"{key}=1", key + "=")
+
+    def load_bindings(binding_class):
+        binding_class.load_bindings()
+
+    def save_bindings(binding_class):
+        binding_class.save_bindings()
+
+    def remove_line(file):
+        for command in commands[:10]:
+            file.remove_line(".Bindings=(", f'Command="{command}"')
+
+    def replace_term(file):
+        for n in range(5):
+            file.replace_term(f"Other{n}\"", f"Renamed{n}\"")
+
+    def full_cycle(file):
+        with File.batch():
+            for command in commands:
+                file.replace_or_add_binding(f'.Bindings=(Name="F2",Command="{command}")', command)
+            file.remove_line(".Bindings=(", f'Command="{commands[0]}"')
+            file.write_lines()
+
+    yield "input: load + index", lambda: fresh_file(input_path), load
+    yield "input: get_line", loaded(input_path), get_line
+    yield "input: load bindings", bindings(input_path), load_bindings
+    yield "input: save bindings", bindings(input_path), save_bindings
+    yield "input: remove_line x10", loaded(input_path), remove_line
+    yield "input: replace_term x5", loaded(input_path), replace_term
+    yield "input: load/modify/save", lambda: fresh_file(input_path), full_cycle
+    yield "game: load + index", lambda: fresh_file(game_path), load
+    yield "game: get_key", loaded(game_path), get_key
+    yield "game: replace_or_add", loaded(game_path), replace_or_add
+
+
+def run(sizes, repeats: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        File.game_directory = directory
+        for lines in sizes:
+            rng = random.Random(lines)
+            input_text, game_text = generate_input_ini(lines, rng), generate_game_ini(lines, rng)
+            input_path = os.path.join(directory, "DefaultInput.ini")
+            game_path = os.path.join(directory, "DefaultGame.ini")
+
+            for name, setup, operation in cases(input_path, game_path, lines):
+                best = None
+                for _ in range(repeats):
+                    # Every repeat starts from the same files on disk
+                    for path, text in ((input_path, input_text), (game_path, game_text)):
+                        with open(path, "w", encoding="utf-8") as file:
+                            file.write(text)
+                    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                        argument = setup()
+                        started = time.perf_counter()
+                        operation(argument)
+                        elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                results.setdefault(name, {})[str(lines)] = best
+    return results
+
+
+def print_table(results: dict, baseline: dict = None):
+    sizes = sorted({int(lines) for timings in results.values() for lines in timings})
+    print(f"{'case (ms, best of runs)':<28}" + "".join(f"{lines:>16}" for lines in sizes))
+    for name, timings in results.items():
+        row = f"{name:<28}"
+        for lines in sizes:
+            value = timings.get(str(lines))
+            cell = "" if value is None else f"{value * 1000:.2f}"
+            old = (baseline or {}).get(name, {}).get(str(lines))
+            if value is not None and old:
+                cell += f" ({value / old:.2f}x)"
+            row += f"{cell:>16}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time files.File on generated INI files, without Tk or a game install.")
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")], default=list(SIZES),
+                        help="comma separated line counts (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--json", help="save the results to this file")
+    parser.add_argument("--compare", help="results saved by an earlier run, shown as ratios")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    results = run(args.sizes, args.repeats)
+    print_table(results, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"python": sys.version.split()[0], "repeats": args.repeats, "results": results}, file, indent=1)
+        print(f"Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
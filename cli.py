@@ -0,0 +1,77 @@
+# Command line launch, without creating the launcher window:
+#   BetterOutlast2Launcher.exe --launch latest --mods "No CPK,Cutscene Skip" --close
+# Only the core package is imported, so the game starts without loading Tk.
+import argparse
+from core.errors import report_error
+
+
+def parse_args(argv=None):
+    """Arguments of the launcher. Unknown arguments are ignored."""
+    parser = argparse.ArgumentParser(description="Better Outlast II Launcher")
+    parser.add_argument("--launch", choices=("latest", "old"),
+                        help="Launch the latest patch or the old patch on startup")
+    parser.add_argument("--mods", default="",
+                        help='Comma-separated mods to launch the latest patch with, e.g. "No CPK,Cutscene Skip"')
+    parser.add_argument("--close", action="store_true",
+                        help="Exit once the game is launched, instead of opening the launcher")
+    parser.add_argument("--profile", action="store_true", help="Profile the startup (see profiler.py)")
+    return parser.parse_known_args(argv)[0]
+
+
+def selected_mods(mods_argument: str, lw_mods: list):
+    """
+    Match the names given to --mods with the launch mods, ignoring case and spaces around commas.
+    :return: The selected mod names, None if one of them doesn't exist
+    """
+    names = {mod.name.lower(): mod.name for mod in lw_mods}
+    selected = []
+    for name in filter(None, (name.strip() for name in mods_argument.split(","))):
+        if name.lower() not in names:
+            report_error(f"Unknown mod '{name}'. Available mods: {', '.join(mod.name for mod in lw_mods)}")
+            return None
+        selected.append(names[name.lower()])
+    return selected
+
+
+def launch(patch: str, mods_argument: str = "") -> bool:
+    """
+    Prepares the selected mods and starts the game, like the Launch Game button.
+    :param patch: "latest" or "old"
+    :return: True if the game was started
+    """
+    from core import paths, game
+    from core.files import File
+    from core.mods import LWMod
+    from core.old_patch import OldPatch
+
+    if not paths.init():
+        return False
+    game.setup()
+
+    if patch == "latest":
+        mods = selected_mods(mods_argument, LWMod.lw_mods)
+        if mods is None:
+            return False
+    else:
+        if mods_argument:
+            print("[WARN] Mods can't be used with the old patch, --mods is ignored")
+        mods = []
+        # Nothing is saved: the launcher config must not exist before the launcher's first launch set up
+        old_patch = OldPatch(save=False)
+        if not old_patch.is_ready():
+            report_error("No valid Old Patch folder is defined. Select it from the launcher first.")
+            return False
+
+    # Config edits of all the mods are written once, before the game starts
+    with File.batch():
+        LWMod.prepare_launch(mods)
+
+    try:
+        if patch == "latest":
+            game.launch_latest_patch()
+        else:
+            old_patch.launch()
+    except Exception as e:
+        report_error(f"Error launching Outlast II: {e}")
+        return False
+    return True
@@ -0,0 +1,35 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_replace(path: str):
+    """
+    Yield a temporary path next to `path`. What is written there replaces `path` in one step
+    when the block exits normally, and is deleted otherwise: `path` is never left half-written.
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                     dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w", fsync: bool = False):
+    """
+    Open a temporary file next to `path`, which replaces `path` once the block succeeds (see atomic_replace).
+    :param fsync: Flush the file to the disk before replacing, for files that must survive a power loss
+    """
+    with atomic_replace(path) as temp_path:
+        with open(temp_path, mode, encoding=None if "b" in mode else "utf-8") as file:
+            yield file
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
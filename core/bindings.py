@@ -0,0 +1,297 @@
+import os
+import bisect
+from core.files import File
+from core.paths import GAME_DIRECTORY, HASH_CACHE_FILE, mod_source
+from core.mods import ReplacementMod
+from core.hash_cache import HashCache
+
+
+class Binding:
+    file: File = None  # DefaultInput.ini, opened by Binding.init()
+    demo_file: File = None
+    bindings = []
+    instances = []
+
+    def __init__(self, command: str, description: str, tooltip: str = None, deletable: bool = True):
+        """
+        :param command: Command triggered by the binding (e.g. "Stat FPS", "Show Collision")
+        :param description: Description of what the binding does (Showed to the user)
+        :param tooltip: Shows a tooltip that helps the user understand what the binding does (Optionnal)
+        :param deletable: If the binding is can be deleted
+        """
+        self.command = command
+        self.description = description
+        self.tooltip_text = tooltip
+        self.key = ""
+        self.deletable = deletable
+
+        Binding.bindings.append(self)
+
+    @staticmethod
+    def init(game_directory: str = GAME_DIRECTORY):
+        """Opens DefaultInput.ini and prepares the console unlocker. Called once, before loading bindings."""
+        Binding.file = File(os.path.join(game_directory, "OLGame/Config/DefaultInput.ini"))
+        DevConsoleBinding.engine_upk = ReplacementMod(name="engine.upk",
+                                                      mod_source_path=mod_source("EngineUPK/Modded"),
+                                                      original_source_path=mod_source("EngineUPK/Original"),
+                                                      install_path=os.path.join(game_directory, "OLGame", "CookedPCConsole"),
+                                                      hash_cache=HashCache(HASH_CACHE_FILE))
+
+    def load_binding(self):
+        """Loads the existing key for a binding in DefaultInput.ini (if it exists)"""
+        _, line = self.file.get_binding(self.command)
+        if line is not None:
+            self.key = line.split('"')[1]
+            return
+        self.key = ""
+
+    def save_binding(self):
+        """Save changes made in DefaultInput.ini"""
+        newline = f'.Bindings=(Name="{self.key}",Command="{self.command}")'
+        self.file.replace_or_add_binding(newline, self.command)
+
+    @classmethod
+    def load_bindings(cls):
+        """Loads all bindings"""
+        for binding in cls.bindings:
+            binding.load_binding()
+
+    @classmethod
+    def save_bindings(cls):
+        """Saves all changes made to bindings"""
+        for binding in cls.bindings:
+            binding.save_binding()
+        cls.file.write_lines()
+
+    def remove(self) -> bool:
+        """
+        Removes the binding from DefaultInput.ini and from its section.
+        :return: False if the binding was already removed
+        """
+        if self not in self.__class__.instances:
+            return False
+        self.file.remove_line(".Bindings=(", f'Command="{self.command}"')
+        Binding.bindings.remove(self)
+        self.__class__.instances.remove(self)
+        return True
+
+
+class MiscBinding(Binding):
+    """
+    Subclass for the section of miscellaneous bindings.
+    Those bindings are not deletable.
+    """
+    instances = []
+
+    def __init__(self, command, description, tooltip=None):
+        super().__init__(command, description, tooltip, deletable=False)
+        self.__class__.instances.append(self)
+
+
+class DoubleBind(MiscBinding):
+    """Class Used specifically for the DoubleBind on interaction key"""
+    def __init__(self):
+        super().__init__(
+            command="setbind LeftMouseButton OLA_USE | setbind",
+            description="Second Bind for\n Interaction",
+            tooltip=("Pressing that key binds both ScrollWheel and Left Mouse Button for interactions.\n"
+                     "You can pass the interactions that need repeated clicking a lot faster with this. "),
+        )
+        self.scroll_direction = "MouseScrollUp"  # Default Value
+
+    def load_binding(self):
+        """Loads the existing key and the scroll direction from DefaultInput.ini"""
+        _, line = self.file.get_line('.Bindings=(Name="', self.command)
+        if line is not None:
+            parts = line.split('"')
+            if len(parts) >= 2:
+                self.key = parts[1]
+            if "mousescrolldown" in line.lower():
+                self.scroll_direction = "MouseScrollDown"
+            else:
+                self.scroll_direction = "MouseScrollUp"
+
+    def save_binding(self):
+        """Saves the key and scroll direction in DefaultInput.ini"""
+        newline = (
+            f'.Bindings=(Name="{self.key}",Command="{self.command} {self.scroll_direction} OLA_USE")'
+        )
+        self.file.replace_or_add(newline, ".Bindings=(", self.command)
+
+    def change_scroll_direction(self, choice):
+        """Changes the scroll direction"""
+        self.scroll_direction = choice
+
+
+class FPSBinding(Binding):
+    """
+    Subclass for the section of FPS bindings.
+    Those bindings are deletable and bindings for custom fps values can be added.
+    """
+    fps_values = set()
+    # Stat FPS binding is manually added to that section, by load_fps_values
+    instances = []
+
+    def __init__(self, fps):
+        """Creates a binding with the command to set the fps to a given value"""
+        super().__init__(command=f"Set OLEngine MaxSmoothedFrameRate {fps}", description=f"Set max FPS to {fps}")
+        self.fps_value = fps
+        bisect.insort(self.__class__.instances, self)
+
+    def __lt__(self, other):
+        """Used to access sorting functions"""
+        # Check if other is an instance of FPSBinding
+        if hasattr(other, "fps_value"):
+            return self.fps_value < other.fps_value
+        return False
+
+    @staticmethod
+    def parse_fps(fps_raw: str):
+        """
+        Reads a fps value typed by the user.
+        :return: The value as an int or a float, None if it isn't a positive number
+        """
+        fps_raw = fps_raw.replace(',', '.')  # Standardized input
+        try:
+            fps = int(fps_raw)
+        except ValueError:
+            try:
+                fps = float(fps_raw)
+            except ValueError:
+                return None
+        return fps if fps > 0 else None
+
+    @classmethod
+    def load_fps_values(cls):
+        """
+        Load existing fps bindings if they exist in DefaultInput.ini.
+        If there are none, a default set of recommended fps values is used.
+        """
+        if not cls.instances:
+            cls.instances.append(Binding(command="Stat FPS", description="Show FPS", deletable=False))
+
+        fps_lines = cls.file.get_lines("Set OLEngine MaxSmoothedFrameRate ")
+        if not fps_lines:
+            cls.fps_values = {3, 5, 8, 30, 60, 75, 105, 120, 144, 1000}
+
+        for line in fps_lines:
+            fps_part = line.lower().split('set olengine maxsmoothedframerate ')[1].split('"')[0]
+            try:
+                fps_value = int(fps_part)
+                cls.fps_values.add(fps_value)
+            except ValueError:
+                print(f"[ERROR] Couldn't convert the fps value to int in {line}")
+
+        for fps in cls.fps_values:
+            cls(fps)
+
+
+class SpeedrunHelperBinding(Binding):
+    """
+    Subclass for the section of bindings related to Speedrunhelper.
+    Those bindings are not deletable.
+    """
+
+    instances = []
+
+    def __init__(self, command, description, tooltip=None):
+        super().__init__(command, description, tooltip, deletable=False)
+        self.__class__.instances.append(self)
+
+
+class OptionalBinding(Binding):
+    """
+    Subclass for the section of FPS bindings.
+    Those bindings are deletable and custom commands can be added (from a predefined list).
+    """
+
+    instances = []
+    default_bindings: list = []
+
+    def __init__(self, command, description, tooltip=None):
+        super().__init__(command, description, tooltip)
+        OptionalBinding.instances.append(self)
+
+    @classmethod
+    def is_added(cls, command: str) -> bool:
+        """Check if this binding has already been added (case-insensitive comparison)"""
+        return any(binding.command.lower() == command.lower() for binding in OptionalBinding.instances)
+
+    @classmethod
+    def add(cls, command: str, description: str):
+        """Adds an optional binding from the predefined lists, as a console binding if it is one."""
+        if any(c == command for c, _ in DevConsoleBinding.dev_bindings):
+            return DevConsoleBinding(command, description)
+        return OptionalBinding(command, description)
+
+    @classmethod
+    def load_optional_bindings(cls):
+        """
+        Iterate through the predefined list of optional bindings and, if a command is found
+        in the file, create an instance of the binding.
+        """
+        for cmd, desc in DevConsoleBinding.dev_bindings:
+            if cls.file:
+                _, line = cls.file.get_key(cmd.rstrip("="))
+                if line is not None:
+                    if line[0] != ";":
+                        if not cls.is_added(cmd):
+                            cls.add(cmd, desc)
+
+        for cmd, desc in cls.default_bindings:
+            if cls.file:
+                _, line = cls.file.get_binding(cmd)
+                if line is not None:
+                    if not cls.is_added(cmd):
+                        cls.add(cmd, desc)
+
+    @classmethod
+    def available_bindings(cls) -> list:
+        """Predefined (command, description) bindings that haven't been added yet"""
+        return [(cmd, desc) for cmd, desc in DevConsoleBinding.dev_bindings + cls.default_bindings
+                if not cls.is_added(cmd)]
+
+
+class DevConsoleBinding(OptionalBinding):
+    engine_upk: ReplacementMod = None  # Created by Binding.init()
+
+    dev_bindings = [
+        ("TypeKey=", "UE Console"),
+        ("ConsoleKey=", "Detailed Console")
+    ]
+
+    @classmethod
+    def enable_console(cls):
+        # install modded engine.upk that enables the console
+        if not cls.engine_upk.is_installed():
+            cls.engine_upk.install()
+
+        # Disable alt key to open the console
+        Binding.file.remove_line("TypeKeyAlt")
+        Binding.file.write_lines()
+
+    def __init__(self, command, description):
+        super().__init__(command, description)
+
+    def load_binding(self):
+        """Loads the existing key for a binding in DefaultInput.ini (if it exists)"""
+        _, line = self.file.get_key(self.command.rstrip("="))
+        if line is not None:
+            self.key = line.split('=')[1]
+            return
+        self.key = ""
+
+    def save_binding(self):
+        """Save changes made in DefaultInput.ini"""
+        newline = f'{self.command}{self.key}'
+        i, line = self.file.get_key(self.command.rstrip("="))
+        self.file.replace_index(newline, i, line)
+
+    def remove(self) -> bool:
+        """Comments the console key out instead of removing it"""
+        if self not in OptionalBinding.instances:
+            return False
+        self.file.replace_term(self.command, f";{self.command}")
+        Binding.bindings.remove(self)
+        OptionalBinding.instances.remove(self)
+        return True
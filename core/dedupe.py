@@ -0,0 +1,339 @@
+import os
+import sys
+import json
+import time
+import ctypes
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core.hash_cache import hash_mapped, HASH_WORKERS
+from core.atomic import atomic_replace, atomic_write
+
+DEDUPE_JOURNAL = "BetterLauncherDedupe.json"  # Saved in the old patch folder, lists the linked files
+JOURNAL_INTERVAL = 5  # Seconds between two saves of the journal while linking
+FICLONE = 0x40049409  # Linux ioctl cloning a whole file (Btrfs, XFS...)
+FSCTL_DUPLICATE_EXTENTS_TO_FILE = 0x00098344  # Windows block cloning (ReFS, Dev Drive)
+FSCTL_SET_SPARSE = 0x000900C4
+CLONE_CHUNK = 1 << 30  # Bytes cloned per call on Windows, a single call must stay under 4 GiB
+
+
+def is_cooked_content(rel_path: str) -> bool:
+    """
+    Only game packages and movies are shared: the game never writes to them.
+    Config folders are excluded, as the game and the launcher edit those files in place.
+    """
+    parts = [part.lower() for part in rel_path.split("/")]
+    if "config" in parts:
+        return False
+    return any(part.startswith("cooked") or part == "movies" for part in parts[:-1])
+
+
+def _list_files(root: str) -> dict:
+    """{relative path: stat} of the cooked content under `root`."""
+    files = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            rel_path = os.path.relpath(path, root).replace("\\", "/")
+            if rel_path != DEDUPE_JOURNAL and is_cooked_content(rel_path):
+                try:
+                    files[rel_path] = os.stat(path)
+                except OSError:
+                    pass
+    return files
+
+
+def _same_file(a: os.stat_result, b: os.stat_result) -> bool:
+    return a.st_dev == b.st_dev and a.st_ino == b.st_ino and a.st_ino != 0
+
+
+class _DuplicateExtentsData(ctypes.Structure):
+    _fields_ = [("FileHandle", ctypes.c_void_p), ("SourceFileOffset", ctypes.c_longlong),
+                ("TargetFileOffset", ctypes.c_longlong), ("ByteCount", ctypes.c_longlong)]
+
+
+def _block_clone(src: str, dst: str):
+    """
+    Windows: create `dst` sharing the clusters of `src` with FSCTL_DUPLICATE_EXTENTS_TO_FILE.
+    Only ReFS volumes (and Dev Drives) support it, NTFS raises OSError.
+    """
+    from ctypes import wintypes
+    import msvcrt
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.DeviceIoControl.argtypes = [wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+                                         wintypes.LPVOID, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD),
+                                         wintypes.LPVOID]
+    kernel32.GetDiskFreeSpaceW.argtypes = [wintypes.LPCWSTR] + [ctypes.POINTER(wintypes.DWORD)] * 4
+    kernel32.GetVolumePathNameW.argtypes = [wintypes.LPCWSTR, wintypes.LPWSTR, wintypes.DWORD]
+
+    def control(handle, code, data=None, size=0):
+        returned = wintypes.DWORD()
+        if not kernel32.DeviceIoControl(handle, code, data, size, None, 0, ctypes.byref(returned), None):
+            raise ctypes.WinError(ctypes.get_last_error())
+
+    # Cloned regions must be cluster aligned: the last one is rounded up past the end of the file
+    volume = ctypes.create_unicode_buffer(261)
+    if not kernel32.GetVolumePathNameW(os.path.abspath(dst), volume, len(volume)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    sectors, sector_size, free, total = (wintypes.DWORD() for _ in range(4))
+    if not kernel32.GetDiskFreeSpaceW(volume.value, ctypes.byref(sectors), ctypes.byref(sector_size),
+                                      ctypes.byref(free), ctypes.byref(total)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    cluster = sectors.value * sector_size.value
+
+    size = os.path.getsize(src)
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        target_handle = msvcrt.get_osfhandle(target.fileno())
+        if os.stat(src).st_file_attributes & 0x200:  # FILE_ATTRIBUTE_SPARSE_FILE, the clone must be sparse too
+            control(target_handle, FSCTL_SET_SPARSE)
+        target.truncate(size)
+        target.flush()
+
+        data = _DuplicateExtentsData(FileHandle=msvcrt.get_osfhandle(source.fileno()))
+        rounded = -(-size // cluster) * cluster
+        for offset in range(0, rounded, CLONE_CHUNK):
+            data.SourceFileOffset = data.TargetFileOffset = offset
+            data.ByteCount = min(CLONE_CHUNK, rounded - offset)
+            control(target_handle, FSCTL_DUPLICATE_EXTENTS_TO_FILE, ctypes.byref(data), ctypes.sizeof(data))
+
+
+def _reflink(src: str, dst: str):
+    """
+    Create `dst` as a copy-on-write clone of `src`: FICLONE on Linux (Btrfs, XFS...),
+    block cloning on Windows (ReFS, Dev Drive). Raises OSError where the filesystem can't.
+    """
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    elif sys.platform == "win32":
+        _block_clone(src, dst)
+    else:
+        raise OSError(f"copy-on-write clones are not supported on {sys.platform}")
+    shutil.copystat(src, dst)
+
+
+class SharedFile:
+    """A file of the old patch with the same contents as a file of the main install."""
+
+    def __init__(self, rel_path: str, target: str, size: int, digest: str, linked: bool):
+        self.rel_path = rel_path
+        self.target = target  # Absolute path of the identical file in the main install
+        self.size = size
+        self.digest = digest
+        self.linked = linked  # Already the same file on disk
+
+
+class Deduplicator:
+    """
+    Finds the old patch files that are byte-identical to files of the main install,
+    and replaces them with reflinks (copy-on-write clones), or with hardlinks if they are allowed.
+
+    Every linked file is recorded in a journal in the old patch folder, so `restore()` can give it
+    back its own copy. Hardlinked files share their data: if Steam ever rewrites one of the main
+    install's files in place, the old patch copy changes too. This is why hardlinks must be allowed
+    explicitly. `restore()` reports those files, verifying the old patch (see DepotManifest.verify)
+    lists them for a re-download.
+    """
+
+    def __init__(self, old_patch_root: str, main_root: str, hash_cache, max_workers: int = HASH_WORKERS):
+        """
+        :param hash_cache: HashCache shared by both trees, hashes are saved as they are calculated
+        """
+        self.old_patch_root = old_patch_root
+        self.main_root = main_root
+        self.hash_cache = hash_cache
+        self.max_workers = max_workers
+        self.journal_file = os.path.join(old_patch_root, DEDUPE_JOURNAL)
+
+    def load_journal(self) -> dict:
+        """{relative path: {"target", "size", "sha1", "method"}} of the files linked so far."""
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as file:
+                return json.load(file).get("files", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def save_journal(self, entries: dict):
+        with atomic_write(self.journal_file) as file:
+            json.dump({"main": self.main_root, "algorithm": self.hash_cache.algorithm, "files": entries},
+                      file, indent=1, sort_keys=True)
+
+    def _hash_all(self, jobs: list, progress=None) -> dict:
+        """
+        Hash (path, stat) pairs in parallel, through the hash cache.
+        :return: {path: hash}, without the files that couldn't be read
+        """
+        hashes, missing = {}, []
+        for path, stat in jobs:
+            cached = self.hash_cache.cached(path, stat)
+            if cached is None:
+                missing.append((path, stat))
+            else:
+                hashes[path] = cached
+
+        total = sum(stat.st_size for _, stat in jobs)
+        done = total - sum(stat.st_size for _, stat in missing)
+        if progress:
+            progress(done, total)
+
+        missing.sort(reverse=True, key=lambda job: job[1].st_size)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(missing)))) as pool:
+                futures = {pool.submit(hash_mapped, path, self.hash_cache.algorithm): (path, stat)
+                           for path, stat in missing}
+                for future in as_completed(futures):
+                    path, stat = futures[future]
+                    try:
+                        hashes[path] = future.result()
+                        self.hash_cache.store(path, stat, hashes[path])
+                    except OSError as e:
+                        print(f"[ERROR] Couldn't read {path}: {e}")
+                    done += stat.st_size
+                    if progress:
+                        progress(done, total)
+        finally:
+            self.hash_cache.save()
+        return hashes
+
+    def scan(self, progress=None) -> list:
+        """
+        Hash the cooked content of both trees and return the old patch files that are identical
+        to a file of the main install, as SharedFile. Only files of equal sizes are hashed.
+        :param progress: Called as progress(done_bytes, total_bytes) while hashing, from the calling thread
+        """
+        old_files = _list_files(self.old_patch_root)
+        main_files = _list_files(self.main_root)
+        main_sizes = {}
+        for rel_path, stat in main_files.items():
+            main_sizes.setdefault(stat.st_size, []).append(rel_path)
+
+        candidates = {rel_path: stat for rel_path, stat in old_files.items() if stat.st_size in main_sizes}
+        needed_main = {rel_path for stat in candidates.values() for rel_path in main_sizes[stat.st_size]}
+        jobs = [(os.path.join(self.old_patch_root, rel_path), stat) for rel_path, stat in candidates.items()]
+        jobs += [(os.path.join(self.main_root, rel_path), main_files[rel_path]) for rel_path in needed_main]
+        hashes = self._hash_all(jobs, progress)
+
+        by_content = {}  # (size, hash) -> main install path, same relative path preferred
+        for rel_path in sorted(needed_main):
+            path = os.path.join(self.main_root, rel_path)
+            if path in hashes:
+                by_content.setdefault((main_files[rel_path].st_size, hashes[path]), path)
+
+        shared = []
+        for rel_path, stat in sorted(candidates.items()):
+            path = os.path.join(self.old_patch_root, rel_path)
+            if path not in hashes:
+                continue
+            same_path = os.path.join(self.main_root, rel_path)
+            key = (stat.st_size, hashes[path])
+            target = same_path if hashes.get(same_path) == key[1] else by_content.get(key)
+            if target:
+                linked = _same_file(stat, main_files[os.path.relpath(target, self.main_root).replace("\\", "/")])
+                shared.append(SharedFile(rel_path, target, stat.st_size, key[1], linked))
+        return shared
+
+    def supports_clones(self) -> bool:
+        """True if the old patch folder's filesystem can make copy-on-write clones."""
+        fd, src = tempfile.mkstemp(suffix=".tmp", dir=self.old_patch_root)
+        dst = f"{src}.clone"
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(b"\0" * 4096)
+            _reflink(src, dst)
+            return True
+        except OSError:
+            return False
+        finally:
+            for path in (src, dst):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def link(self, shared: list, progress=None, allow_hardlinks: bool = False) -> int:
+        """
+        Replace the old patch copies of `shared` files with links into the main install.
+        Each file is swapped in atomically, and only if neither copy changed since the scan.
+        :param progress: Called as progress(done, total, rel_path) after each file
+        :param allow_hardlinks: Hardlink the files that can't be cloned (their data is then shared, see above)
+        :return: Bytes freed
+        """
+        entries = self.load_journal()
+        freed = 0
+        last_save = time.monotonic()
+        try:
+            for done, item in enumerate(shared, start=1):
+                if not item.linked:
+                    method = self._link_file(item, allow_hardlinks)
+                    if method:
+                        entries[item.rel_path] = {"target": item.target, "size": item.size,
+                                                  self.hash_cache.algorithm: item.digest, "method": method}
+                        freed += item.size
+                if progress:
+                    progress(done, len(shared), item.rel_path)
+                if time.monotonic() - last_save >= JOURNAL_INTERVAL:
+                    self.save_journal(entries)
+                    last_save = time.monotonic()
+        finally:
+            self.save_journal(entries)
+        return freed
+
+    def _link_file(self, item: SharedFile, allow_hardlinks: bool = False):
+        """Link one file, return the method used ("reflink" or "hardlink"), None if it was skipped."""
+        path = os.path.join(self.old_patch_root, item.rel_path)
+        try:
+            for checked in (path, item.target):
+                if self.hash_cache.cached(checked, os.stat(checked)) != item.digest:
+                    print(f"[WARN] {checked} changed since it was scanned, skipped")
+                    return None
+        except OSError as e:
+            print(f"[WARN] {e}, skipped")
+            return None
+
+        methods = [("reflink", _reflink)] + ([("hardlink", os.link)] if allow_hardlinks else [])
+        for method, create in methods:
+            try:
+                with atomic_replace(path) as temp_path:
+                    os.remove(temp_path)  # Links need a free name
+                    create(item.target, temp_path)
+                return method
+            except OSError:
+                pass
+        print(f"[WARN] Couldn't link {path} to {item.target} (different drives, or no clone support), skipped")
+        return None
+
+    def restore(self, progress=None) -> list:
+        """
+        Give every linked file of the journal its own copy again.
+        :param progress: Called as progress(done, total, rel_path) after each file
+        :return: Relative paths of the files whose contents changed since they were linked,
+                 they must be downloaded again
+        """
+        entries = self.load_journal()
+        damaged = []
+        items = sorted(entries.items())
+        try:
+            for done, (rel_path, entry) in enumerate(items, start=1):
+                path = os.path.join(self.old_patch_root, rel_path)
+                try:
+                    stat = os.stat(path)
+                    digest = self.hash_cache.cached(path, stat) or hash_mapped(path, self.hash_cache.algorithm)
+                    if entry["method"] == "hardlink" and stat.st_nlink > 1:
+                        self._unlink_copy(path)
+                    if digest != entry[self.hash_cache.algorithm]:
+                        damaged.append(rel_path)
+                    del entries[rel_path]
+                except (OSError, KeyError) as e:
+                    print(f"[ERROR] Couldn't restore {path}: {e}")
+                if progress:
+                    progress(done, len(items), rel_path)
+        finally:
+            self.save_journal(entries)
+        return damaged
+
+    @staticmethod
+    def _unlink_copy(path: str):
+        """Replace a hardlink with an independent copy of its contents."""
+        with atomic_replace(path) as temp_path:
+            shutil.copy2(path, temp_path)
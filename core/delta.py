@@ -0,0 +1,144 @@
+import re
+import sys
+import lzma
+import bisect
+import struct
+import hashlib
+
+# Patch layout: MAGIC, HEADER, then an lzma stream of operations.
+# COPY copies a range of the source file, INSERT adds bytes that aren't in it.
+MAGIC = b"BOLDELTA1"
+HEADER = struct.Struct("<32s32sQ")      # Source sha256, target sha256, target size
+COPY = struct.Struct("<cQI")            # b"C", source offset, length
+INSERT = struct.Struct("<cI")           # b"I", length, followed by the bytes
+KEY_SIZE = 32     # Bytes compared to find a candidate match, the shortest copy
+# Anchors: the positions where a byte of the first set is followed by a byte of the second,
+# one position in 64 on average. They depend on the content only, so they line up in both files
+# even where the target has shifted. Zero and 0xFF padding never starts one.
+ANCHOR = re.compile(b"[%s](?=[%s])" % (b"".join(re.escape(bytes([b])) for b in range(3, 256, 8)),
+                                      b"".join(re.escape(bytes([b])) for b in range(6, 256, 8))))
+
+
+class PatchError(Exception):
+    pass
+
+
+def _match_length(source: bytes, source_offset: int, target: bytes, target_offset: int) -> int:
+    """Length of the common run of bytes starting at both offsets, compared by slices."""
+    length, step = 0, 4096
+    limit = min(len(source) - source_offset, len(target) - target_offset)
+    while length < limit:
+        size = min(step, limit - length)
+        if source[source_offset + length:source_offset + length + size] == \
+                target[target_offset + length:target_offset + length + size]:
+            length += size
+        elif step > 1:
+            step = max(step // 8, 1)  # Narrow down the first difference
+        else:
+            break
+    return length
+
+
+def make_patch(source: bytes, target: bytes) -> bytes:
+    """
+    Build a patch turning `source` into `target`.
+    The KEY_SIZE bytes at each anchor of the source are indexed, then only the anchors of the target
+    are looked up: the scan for anchors runs in the regex engine instead of byte by byte.
+    Matches are extended both ways, everything else is inserted as is.
+    """
+    index = {}
+    for match in ANCHOR.finditer(source, 0, len(source) - KEY_SIZE + 1):
+        offset = match.start()
+        index.setdefault(source[offset:offset + KEY_SIZE], offset)
+
+    anchors = [match.start() for match in ANCHOR.finditer(target, 0, len(target) - KEY_SIZE + 1)]
+    ops = []
+    insert_start = position = 0
+
+    def flush_insert(end):
+        if end > insert_start:
+            ops.append(INSERT.pack(b"I", end - insert_start))
+            ops.append(target[insert_start:end])
+
+    next_anchor = 0
+    while next_anchor < len(anchors):
+        position = anchors[next_anchor]
+        next_anchor += 1
+        source_offset = index.get(target[position:position + KEY_SIZE])
+        if source_offset is None:
+            continue
+
+        # Extend backwards over bytes that would otherwise be inserted
+        back = 0
+        while (back < source_offset and position - back > insert_start
+               and source[source_offset - back - 1] == target[position - back - 1]):
+            back += 1
+        source_offset -= back
+        position -= back
+
+        length = _match_length(source, source_offset, target, position)
+        flush_insert(position)
+        ops.append(COPY.pack(b"C", source_offset, length))
+        position += length
+        insert_start = position
+        next_anchor = bisect.bisect_left(anchors, position, next_anchor)
+    flush_insert(len(target))
+
+    header = HEADER.pack(hashlib.sha256(source).digest(), hashlib.sha256(target).digest(), len(target))
+    return MAGIC + header + lzma.compress(b"".join(ops))
+
+
+def apply_patch(source: bytes, patch: bytes) -> bytes:
+    """Rebuild the target of a patch. Raises PatchError if the source or the result don't match."""
+    if not patch.startswith(MAGIC):
+        raise PatchError("not a launcher patch")
+    source_hash, target_hash, target_size = HEADER.unpack_from(patch, len(MAGIC))
+    if hashlib.sha256(source).digest() != source_hash:
+        raise PatchError("the patch was made for another version")
+    try:
+        ops = lzma.decompress(patch[len(MAGIC) + HEADER.size:])
+    except lzma.LZMAError as e:
+        raise PatchError(f"corrupted patch: {e}")
+
+    output = bytearray()
+    position = 0
+    try:
+        while position < len(ops):
+            if ops[position:position + 1] == b"C":
+                _, offset, length = COPY.unpack_from(ops, position)
+                output += source[offset:offset + length]
+                position += COPY.size
+            else:
+                _, length = INSERT.unpack_from(ops, position)
+                position += INSERT.size
+                output += ops[position:position + length]
+                position += length
+    except struct.error as e:
+        raise PatchError(f"corrupted patch: {e}")
+
+    if len(output) != target_size or hashlib.sha256(output).digest() != target_hash:
+        raise PatchError("the patched file doesn't match the expected result")
+    return bytes(output)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5 or sys.argv[1] not in ("make", "apply"):
+        print("Usage: python -m core.delta make <old file> <new file> <patch>\n"
+              "       python -m core.delta apply <old file> <patch> <new file>")
+        sys.exit(1)
+
+    with open(sys.argv[2], "rb") as file:
+        old = file.read()
+    with open(sys.argv[3], "rb") as file:
+        data = file.read()
+    if sys.argv[1] == "make":
+        result = make_patch(old, data)
+    else:
+        try:
+            result = apply_patch(old, data)
+        except PatchError as e:
+            print(f"Couldn't apply the patch: {e}")
+            sys.exit(1)
+    with open(sys.argv[4], "wb") as file:
+        file.write(result)
+    print(f"{sys.argv[4]} written ({len(result)} bytes)")
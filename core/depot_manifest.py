@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import time
+import bisect
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core.hash_cache import hash_file, hash_mapped, HASH_WORKERS
+
+APP_ID = "414700"       # Outlast 2
+DEPOT_ID = "414701"     # Windows files depot
+MANIFEST_ID = "7085410466650398118"  # Manifest from 10 May 2017, the old patch
+MANIFEST_ALGORITHM = "sha1"  # Steam depot manifests identify file contents by SHA-1
+CHECKPOINT_INTERVAL = 10  # Seconds between two saves of the hash cache while verifying
+DIRECTORY_FLAG = 64  # Flag of the directory entries in a depot manifest listing
+FULL_COUNT_INTERVAL = 10  # Minimum seconds between two checks of every file, when the changed paths are unknown
+
+
+class DepotManifest:
+    """
+    Files of a Steam depot, as {relative path: (size, sha1)}.
+    Generated once with `python -m core.depot_manifest <listing or folder> <output.json>`, preferably from
+    the file list Steam publishes for the depot (see from_listing) rather than from a download.
+    """
+
+    def __init__(self, files: dict, depot_id: str = DEPOT_ID, manifest_id: str = MANIFEST_ID):
+        self.files = files
+        self.depot_id = depot_id
+        self.manifest_id = manifest_id
+
+    @property
+    def total_size(self) -> int:
+        return sum(size for size, _ in self.files.values())
+
+    @classmethod
+    def load(cls, path: str, depot_id: str = DEPOT_ID, manifest_id: str = MANIFEST_ID):
+        """Load a manifest file, None if it is missing, invalid or made for another depot or manifest."""
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            files = {rel_path: (entry["size"], entry[MANIFEST_ALGORITHM]) for rel_path, entry in data["files"].items()}
+            ids = (str(data["depot"]), str(data["manifest"]))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        if ids != (depot_id, manifest_id):
+            print(f"[WARN] {path} describes depot {ids[0]} manifest {ids[1]}, "
+                  f"expected depot {depot_id} manifest {manifest_id}: ignored")
+            return None
+        return cls(files, *ids)
+
+    @classmethod
+    def from_listing(cls, path: str):
+        """
+        Read the text listing of a Steam depot manifest, as written by
+        `DepotDownloader -app 414700 -depot 414701 -manifest 7085410466650398118 -manifest-only`.
+        The sizes and SHA-1 come from Steam, not from a local download. Raises ValueError if it isn't one.
+        """
+        files = {}
+        depot_id = manifest_id = None
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("Content Manifest for Depot"):
+                    depot_id = line.split()[-1]
+                elif line.startswith("Manifest ID"):
+                    manifest_id = line.split(":", 1)[1].split("/")[0].strip()
+                else:
+                    fields = line.split(maxsplit=4)
+                    if len(fields) == 5 and fields[0].isdigit() and fields[3].isdigit():
+                        size, _, digest, flags, name = fields
+                        if not int(flags) & DIRECTORY_FLAG:
+                            files[name.strip().replace("\\", "/")] = (int(size), digest.lower())
+        if depot_id is None or manifest_id is None or not files:
+            raise ValueError(f"{path} isn't a depot manifest listing")
+        return cls(files, depot_id, manifest_id)
+
+    @classmethod
+    def from_folder(cls, root: str, depot_id: str = DEPOT_ID, manifest_id: str = MANIFEST_ID):
+        files = {}
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                rel_path = os.path.relpath(path, root).replace("\\", "/")
+                files[rel_path] = (os.path.getsize(path), hash_file(path, MANIFEST_ALGORITHM))
+        return cls(files, depot_id, manifest_id)
+
+    def save(self, path: str):
+        data = {
+            "depot": self.depot_id,
+            "manifest": self.manifest_id,
+            "files": {rel_path: {"size": size, MANIFEST_ALGORITHM: digest}
+                      for rel_path, (size, digest) in sorted(self.files.items())},
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1)
+
+    def verify(self, root: str, hash_cache, progress=None, max_workers: int = HASH_WORKERS) -> dict:
+        """
+        Check every file of the manifest under `root`, hashing them in parallel.
+        Hashes are saved in `hash_cache` (a HashCache using MANIFEST_ALGORITHM) as they are calculated,
+        so an interrupted or repeated verification only hashes the files that changed since.
+        :param progress: Called as progress(done_bytes, total_bytes, rel_path) after each file, from the calling thread
+        :return: {relative path: problem} for the files that are missing, have the wrong size or are corrupted
+        """
+        problems = {}
+        jobs = []  # (size, relative path, absolute path, stat) of the files that must be hashed
+        total, done = self.total_size, 0
+        for rel_path, (size, digest) in self.files.items():
+            path = os.path.join(root, *rel_path.split("/"))
+            try:
+                stat = os.stat(path)
+            except OSError:
+                problems[rel_path] = "missing"
+                done += size
+                continue
+            if stat.st_size != size:
+                problems[rel_path] = "wrong size"
+                done += size
+            else:
+                cached = hash_cache.cached(path, stat)
+                if cached is None:
+                    jobs.append((size, rel_path, path, stat))
+                else:
+                    if cached != digest:
+                        problems[rel_path] = "corrupted"
+                    done += size
+        if progress:
+            progress(done, total, "")
+
+        # Biggest files first, so a large package doesn't end up hashed alone at the end
+        jobs.sort(reverse=True, key=lambda job: job[0])
+        last_checkpoint = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+                futures = {pool.submit(hash_mapped, path, MANIFEST_ALGORITHM): (size, rel_path, path, stat)
+                           for size, rel_path, path, stat in jobs}
+                for future in as_completed(futures):
+                    size, rel_path, path, stat = futures[future]
+                    try:
+                        digest = future.result()
+                    except OSError as e:
+                        print(f"[ERROR] Couldn't read {path}: {e}")
+                        problems[rel_path] = "unreadable"
+                    else:
+                        hash_cache.store(path, stat, digest)
+                        if digest != self.files[rel_path][1]:
+                            problems[rel_path] = "corrupted"
+
+                    done += size
+                    if progress:
+                        progress(done, total, rel_path)
+                    if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                        hash_cache.save()
+                        last_checkpoint = time.monotonic()
+        finally:
+            hash_cache.save()
+        return problems
+
+
+class CompletionCounter:
+    """
+    Counts the files of a manifest that already have their final size under `root`, while they download.
+    Like FolderSizeTracker, an update only checks the paths reported by a filesystem watcher.
+    """
+
+    def __init__(self, manifest: DepotManifest, root: str):
+        self.sizes = {os.path.join(root, *rel_path.split("/")): size for rel_path, (size, _) in manifest.files.items()}
+        self.paths = sorted(self.sizes)
+        self.complete = set()
+        self.last_full_count = None
+
+    def update(self, file_size, changed_paths: set = None) -> int:
+        """
+        Bring the count up to date and return it.
+        :param file_size: Called with an absolute path, returns its known size or None (see FolderSizeTracker.file_size)
+        :param changed_paths: Paths reported by a watcher (see fs_watch). None means they are unknown:
+                              every file is checked, at most once every FULL_COUNT_INTERVAL seconds.
+        """
+        if changed_paths is None:
+            if self.last_full_count is not None and time.monotonic() - self.last_full_count < FULL_COUNT_INTERVAL:
+                return len(self.complete)
+            self.last_full_count = time.monotonic()
+            paths = self.paths
+        else:
+            paths = set()
+            for path in changed_paths:
+                if path in self.sizes:
+                    paths.add(path)
+                    continue
+                # A directory: the files below it may have been created, moved or deleted with it
+                prefix = os.path.join(path, "")
+                for i in range(bisect.bisect_left(self.paths, prefix), len(self.paths)):
+                    if not self.paths[i].startswith(prefix):
+                        break
+                    paths.add(self.paths[i])
+
+        for path in paths:
+            if file_size(path) == self.sizes[path]:
+                self.complete.add(path)
+            else:
+                self.complete.discard(path)
+        return len(self.complete)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python -m core.depot_manifest <manifest listing | depot folder> <output.json> "
+              "[depot id] [manifest id]\n"
+              "The listing is written by DepotDownloader -manifest-only, and holds the hashes published by Steam.\n"
+              f"A folder is hashed as is. The old patch is depot {DEPOT_ID} manifest {MANIFEST_ID}, used by default.")
+        sys.exit(1)
+    if os.path.isfile(sys.argv[1]):
+        manifest = DepotManifest.from_listing(sys.argv[1])
+    else:
+        manifest = DepotManifest.from_folder(sys.argv[1], *sys.argv[3:5])
+    manifest.save(sys.argv[2])
+    print(f"Manifest of {len(manifest.files)} files ({manifest.total_size} bytes) written to {sys.argv[2]}")
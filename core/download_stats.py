@@ -0,0 +1,85 @@
+import math
+import time
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+
+
+class DownloadStats:
+    """
+    Download rate, ETA and stall detection, from samples of the downloaded size.
+    The rate is an exponential moving average weighted by the time between samples,
+    so irregular samples (e.g. pushed by a filesystem watcher) are handled correctly.
+    """
+
+    def __init__(self, expected_size: int, time_constant: float = 10.0, stall_after: float = 120.0):
+        """
+        :param time_constant: Seconds after which an old rate only weighs ~37% of the average
+        :param stall_after: Seconds without any progress before the download is considered stalled
+        """
+        self.expected_size = expected_size
+        self.time_constant = time_constant
+        self.stall_after = stall_after
+        self.rate = None          # Smoothed bytes per second
+        self.last_size = None
+        self.last_time = None
+        self.last_progress = None  # Time the size last grew
+
+    def add_sample(self, size: int, timestamp: float = None):
+        now = time.monotonic() if timestamp is None else timestamp
+        if self.last_time is None:
+            self.last_size, self.last_time, self.last_progress = size, now, now
+            return
+
+        elapsed = now - self.last_time
+        if elapsed <= 0:
+            return
+        if size > self.last_size:
+            self.last_progress = now
+
+        instant_rate = max(0, size - self.last_size) / elapsed
+        weight = 1 - math.exp(-elapsed / self.time_constant)
+        self.rate = instant_rate if self.rate is None else self.rate + weight * (instant_rate - self.rate)
+        self.last_size, self.last_time = size, now
+
+    @property
+    def complete(self) -> bool:
+        return self.last_size is not None and self.last_size >= self.expected_size
+
+    def eta(self):
+        """Seconds left at the current rate, None if unknown."""
+        if self.complete:
+            return 0
+        if not self.rate or self.last_size is None:
+            return None
+        return (self.expected_size - self.last_size) / self.rate
+
+    def stalled_for(self, now: float = None) -> float:
+        """Seconds since the last progress if the download is stalled, 0 otherwise."""
+        if self.last_progress is None or self.complete:
+            return 0
+        idle = (time.monotonic() if now is None else now) - self.last_progress
+        return idle if idle >= self.stall_after else 0
+
+    def describe(self) -> str:
+        stalled = self.stalled_for()
+        if stalled:
+            return f"⚠ No progress for {format_duration(stalled)}, the download may be stuck"
+        eta = self.eta()
+        if self.rate is None or eta is None:
+            return "Measuring download speed..."
+        return f"{format_size(self.rate)}/s, {format_duration(eta)} left"
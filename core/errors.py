@@ -0,0 +1,17 @@
+_error_handler = None  # Set by the GUI to show errors in a message box
+
+
+def set_error_handler(handler):
+    """
+    :param handler: Called with the message of every error reported by the core, None to print them
+    """
+    global _error_handler
+    _error_handler = handler
+
+
+def report_error(message: str):
+    """Show an error to the user, or print it when no GUI is running."""
+    if _error_handler is None:
+        print(f"[ERROR] {message}")
+    else:
+        _error_handler(message)
@@ -0,0 +1,589 @@
+import os
+import re
+import bisect
+import shutil
+import hashlib
+from contextlib import contextmanager
+from core.errors import report_error
+from core.atomic import atomic_replace
+
+
+_BINDING_COMMAND = re.compile(r'command="([^"]*)"')
+
+
+def _signature(path: str):
+    """(size, mtime) of a file, None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    except OSError:
+        return None
+
+
+class _IniIndex:
+    """
+    Case-insensitive lookup tables over the lines of an INI file.
+    Keys are indexed with or without a leading ";" so commented settings are still found.
+    """
+
+    def __init__(self, lines: list):
+        self.lower = []          # Lowercased lines, searched without lowering them again
+        self.line_sections = []  # Section of each line
+        self.keys = {}           # key -> positions, all sections
+        self.sections = {}       # section -> key -> positions
+        self.commands = {}       # .Bindings=( command -> positions
+        self._text = None        # Lowercased lines joined, searched with str.find, and the start of each line
+        self._starts = None
+
+        section = ""
+        for line in lines:
+            header = self.add(line, section)
+            if header is not None:
+                section = header
+
+    @staticmethod
+    def _parse(lower: str):
+        """Return (section header, key, binding command) found in a lowercased line."""
+        stripped = lower.strip()
+        if stripped.startswith("[") and stripped.endswith("]"):
+            return stripped[1:-1].strip(), None, None
+        if "=" not in stripped:
+            return None, None, None
+
+        key = stripped.split("=", 1)[0].lstrip(";").strip()
+        command = None
+        if ".bindings=(" in stripped:
+            match = _BINDING_COMMAND.search(stripped)
+            if match:
+                command = match.group(1)
+        return None, key, command
+
+    @staticmethod
+    def _insert(table: dict, name: str, i: int):
+        positions = table.setdefault(name, [])
+        if not positions or positions[-1] < i:
+            positions.append(i)
+        else:
+            bisect.insort(positions, i)
+
+    @staticmethod
+    def _discard(table: dict, name: str, i: int):
+        positions = table.get(name)
+        if positions:
+            positions.remove(i)
+            if not positions:
+                del table[name]
+
+    def _register(self, i: int, section: str):
+        _, key, command = self._parse(self.lower[i])
+        if key:
+            self._insert(self.keys, key, i)
+            self._insert(self.sections.setdefault(section, {}), key, i)
+        if command is not None:
+            self._insert(self.commands, command, i)
+
+    def add(self, line: str, section: str = None):
+        """Index a line appended at the end of the file. Returns its section name if it is a header."""
+        if section is None:
+            section = self.line_sections[-1] if self.line_sections else ""
+        lower = line.lower()
+        header, _, _ = self._parse(lower)
+        if header is not None:
+            section = header
+
+        self.lower.append(lower)
+        self.line_sections.append(section)
+        self._register(len(self.lower) - 1, section)
+        self._text = None
+        return header
+
+    def replace(self, i: int, line: str) -> bool:
+        """
+        Re-index line i after it was replaced by `line`.
+        Returns False if the index can't be patched (section headers moved) and must be rebuilt.
+        """
+        lower = line.lower()
+        old_header, old_key, old_command = self._parse(self.lower[i])
+        new_header, _, _ = self._parse(lower)
+        if old_header is not None or new_header is not None:
+            return False
+
+        section = self.line_sections[i]
+        if old_key:
+            self._discard(self.keys, old_key, i)
+            self._discard(self.sections[section], old_key, i)
+        if old_command is not None:
+            self._discard(self.commands, old_command, i)
+
+        self.lower[i] = lower
+        self._register(i, section)
+        self._text = None
+        return True
+
+    def delete(self, positions: list) -> bool:
+        """
+        Drop the lines at `positions` (sorted) and shift the positions of the lines after them.
+        Returns False if a section header is deleted, the index must then be rebuilt.
+        """
+        if any(self._parse(self.lower[i])[0] is not None for i in positions):
+            return False
+
+        removed = set(positions)
+        first = positions[0]
+        for table in (self.keys, self.commands, *self.sections.values()):
+            for name, old_positions in list(table.items()):
+                if old_positions[-1] < first:
+                    continue  # Nothing to shift before the first deleted line
+                kept = [p - bisect.bisect_left(positions, p) for p in old_positions if p not in removed]
+                if kept:
+                    table[name] = kept
+                else:
+                    del table[name]
+
+        for i in reversed(positions):
+            del self.lower[i]
+            del self.line_sections[i]
+        self._text = None
+        return True
+
+    def _containing(self, term: str) -> list:
+        """Positions of the lines containing `term` (lowercase), found with str.find over the joined lines."""
+        if "\n" in term:
+            return [i for i, lower in enumerate(self.lower) if term in lower]
+        if self._text is None:
+            self._text = "".join(self.lower)
+            self._starts, offset = [], 0
+            for lower in self.lower:
+                self._starts.append(offset)
+                offset += len(lower)
+
+        positions = []
+        found = self._text.find(term)
+        while found != -1:
+            i = bisect.bisect_right(self._starts, found) - 1
+            positions.append(i)
+            if i + 1 >= len(self._starts):
+                break
+            found = self._text.find(term, self._starts[i + 1])  # At most one match per line
+        return positions
+
+    def matching(self, terms: list) -> list:
+        """
+        Positions of the lines containing all `terms` (lowercase).
+        A Command="..." term of a .Bindings=( search is looked up in the command table,
+        otherwise the lines containing the longest term are checked for the others.
+        """
+        if not terms:
+            return list(range(len(self.lower)))
+
+        candidates = None
+        if any(".bindings=(" in term for term in terms):
+            for term in terms:
+                match = _BINDING_COMMAND.fullmatch(term)
+                if match:
+                    candidates = self.commands.get(match.group(1), [])
+                    break
+        if candidates is None:
+            candidates = self._containing(max(terms, key=len))
+        return [i for i in candidates if all(term in self.lower[i] for term in terms)]
+
+
+class File:
+    files = []
+    instances = {}  # Normalized path -> File, so each INI has a single in-memory copy
+    game_directory = os.getcwd()
+    demo_directory = None
+    batch_depth = 0  # Number of File.batch() blocks currently open
+    pending = []     # Files written during a batch, flushed when the outermost block exits
+    merge_on_reload = True  # Replay unsaved edits when a file is reloaded after an outside change
+    synced = {}  # Old patch file path -> (hash of the content synced into it, its signature once written)
+
+    def __new__(cls, path: str, demo_file: bool = False):
+        key = os.path.normcase(os.path.abspath(path))
+        instance = cls.instances.get(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            cls.instances[key] = instance
+        return instance
+
+    def __init__(self, path: str, demo_file: bool = False):
+        # The same object is returned for a path already opened: only set it up once
+        if not hasattr(self, "path"):
+            self.path = path
+            self.local_path = os.path.relpath(self.path, self.__class__.game_directory)
+            self._lines = None  # Read on first access
+            self._index = None
+            self.dirty = False  # Changes waiting for the end of a batch
+            self.disk_digest = None  # Hash of the content last read from or written to disk
+            self.signature = None  # (size, mtime) of the file when it was last read or written
+            self.edits = []  # Unsaved edits, replayed if the file changes on disk
+            self.sync_digest = None  # Hash of the content synced into this old patch file, recorded once written
+
+        if not demo_file and self not in self.__class__.files:
+            self.__class__.files.append(self)
+
+    @property
+    def lines(self) -> list:
+        if self._lines is None:
+            self._load()
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines: list):
+        """Replace the whole content of the file (unsaved until write_lines)."""
+        if self._lines is None:
+            self.signature = self._stat()
+        self._lines = lines
+        self._index = None
+        self.edits = [("set", list(lines))]
+
+    @property
+    def index(self) -> _IniIndex:
+        """Index of the current lines, built on first use and patched on small edits."""
+        self.refresh()
+        if self._index is None:
+            self._index = _IniIndex(self.lines)
+        return self._index
+
+    def _stat(self):
+        return _signature(self.path)
+
+    def _load(self):
+        self.signature = self._stat()  # Taken before reading: a write during the read triggers another reload
+        self._lines = self._read_lines()
+        self._index = None
+        self.disk_digest = self._digest(self._lines)
+
+    def refresh(self) -> bool:
+        """
+        Reload the file if it changed on disk since it was read or written (e.g. the game rewrote it on exit).
+        Unsaved edits are replayed on top of the new content, unless merge_on_reload is disabled.
+        Only costs a stat when nothing changed. Returns True if the file was reloaded.
+        """
+        if self._lines is None or self._stat() == self.signature:
+            return False
+
+        edits = self.edits
+        self.edits = []
+        self._load()
+        if not edits:
+            print(f"[INFO] {self.path} changed on disk, reloaded")
+        elif self.__class__.merge_on_reload:
+            print(f"[INFO] {self.path} changed on disk, merging {len(edits)} unsaved edits")
+            self._replay(edits)
+        else:
+            print(f"[WARN] {self.path} changed on disk, discarded {len(edits)} unsaved edits")
+        return True
+
+    def _replay(self, edits: list):
+        for edit, *args in edits:
+            if edit == "set":
+                self.lines = args[0]
+            elif edit == "replace":
+                self._replay_replace(*args)
+            elif edit == "append":
+                self._append(args[0].rstrip("\n"))
+            elif edit == "remove":
+                self.remove_line(*args[0])
+            elif edit == "replace_term":
+                self.replace_term(*args)
+            elif edit == "delete_duplicates":
+                self.delete_duplicates(*args)
+            elif edit == "rules":
+                self.apply_rules(args[0])
+
+    def _replay_replace(self, old_line: str, new_line: str):
+        """Replace `old_line` again, found by content, then by binding command or key if it was modified."""
+        if old_line in self.lines:
+            i = self.lines.index(old_line)
+        else:
+            _, key, command = _IniIndex._parse(old_line.lower())
+            if command is not None:
+                i, _ = self.get_binding(command)
+            elif key:
+                i, _ = self.get_key(key)
+            else:
+                print(f"[WARN] Could not merge edit of {old_line.strip()} in {self.path}")
+                return
+
+        if i >= 0:
+            self._set_line(new_line.rstrip("\n"), i)
+        else:
+            self._append(new_line.rstrip("\n"))
+
+    def _set_line(self, new_line: str, i: int):
+        """Replace line i, keeping the index up to date."""
+        self.edits.append(("replace", self.lines[i], f"{new_line}\n"))
+        self._patch_line(i, f"{new_line}\n")
+
+    def _patch_line(self, i: int, line: str):
+        """Set line i (ending with a newline) and re-index it."""
+        self.lines[i] = line
+        if self._index is not None and not self._index.replace(i, line):
+            self._index = None
+
+    def _delete_lines(self, positions: list):
+        """Delete the lines at `positions` (sorted), shifting the index instead of rebuilding it."""
+        if not positions:
+            return
+        for i in reversed(positions):
+            del self.lines[i]
+        if self._index is not None and not self._index.delete(positions):
+            self._index = None
+
+    def _append(self, new_line: str):
+        """Append a line, keeping the index up to date."""
+        self.edits.append(("append", f"{new_line}\n"))
+        self.lines.append(f"{new_line}\n")
+        if self._index is not None:
+            self._index.add(self.lines[-1])
+
+    def _read_lines(self):
+        if not os.path.exists(self.path):
+            report_error(f"File not found: {self.path}")
+            return []
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return file.readlines()
+        except Exception as e:
+            report_error(f"Unable to read file {self.path}: {e}")
+            return []
+
+    def write_lines(self):
+        """Write the lines to disk, or mark the file dirty until the current batch ends."""
+        if File.batch_depth > 0:
+            if not self.dirty:
+                self.dirty = True
+                File.pending.append(self)
+            return
+        self._write()
+
+    @staticmethod
+    def _digest(lines: list) -> str:
+        return hashlib.sha256("".join(lines).encode("utf-8")).hexdigest()
+
+    def digest(self) -> str:
+        """Hash of the current (possibly unsaved) content, reloaded first if the file changed on disk."""
+        self.refresh()
+        return self._digest(self.lines)
+
+    def _write(self):
+        """Atomically replace the file with the current lines, unless they match what is on disk."""
+        self.dirty = False
+        self.refresh()
+        digest = self._digest(self.lines)
+        if digest == self.disk_digest and os.path.exists(self.path):
+            self.edits = []
+            self._record_sync(digest)
+            return
+
+        try:
+            with atomic_replace(self.path) as temp_path:
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    file.writelines(self.lines)
+                    file.flush()
+                    os.fsync(file.fileno())
+                if os.path.exists(self.path):
+                    shutil.copymode(self.path, temp_path)
+            self.disk_digest = digest
+            self.signature = self._stat()
+            self.edits = []
+            self._record_sync(digest)
+            print(f"[INFO] Updated lines written in {self.path}")
+        except Exception as e:
+            report_error(f"Unable to write to file {self.path}: {e}")
+
+    @classmethod
+    @contextmanager
+    def batch(cls):
+        """
+        Group writes: inside the block, write_lines() only marks files dirty,
+        and each dirty file is written once when the outermost block exits.
+        """
+        File.batch_depth += 1
+        try:
+            yield
+        finally:
+            File.batch_depth -= 1
+            if File.batch_depth == 0:
+                cls.flush()
+
+    @classmethod
+    def flush(cls):
+        """Write every file left dirty by a batch."""
+        pending, File.pending = File.pending, []
+        for file in pending:
+            if file.dirty:
+                file._write()
+
+    def get_line(self, *search_terms: str) -> (int, str):
+        positions = self.index.matching([term.lower() for term in search_terms])
+        if not positions:
+            return -1, None
+        return positions[0], self.lines[positions[0]].strip()
+
+    def get_lines(self, *search_terms: str):
+        return [self.lines[i].strip() for i in self.index.matching([term.lower() for term in search_terms])]
+
+    def get_key(self, key: str, section: str = None) -> (int, str):
+        """
+        Return the first line setting `key` (e.g. "SyncInterval"), optionally only within `section`.
+        Commented lines are returned too, like get_line would.
+        """
+        table = self.index.keys if section is None else self.index.sections.get(section.lower(), {})
+        positions = table.get(key.strip().lower())
+        if not positions:
+            return -1, None
+        return positions[0], self.lines[positions[0]].strip()
+
+    def get_binding(self, command: str) -> (int, str):
+        """Return the first .Bindings=(...) line whose Command is exactly `command` (case-insensitive)."""
+        positions = self.index.commands.get(command.lower())
+        if not positions:
+            return -1, None
+        return positions[0], self.lines[positions[0]].strip()
+
+    def get_lines_after(self, *search_terms):
+        i, _ = self.get_line(*search_terms)
+
+        if i == -1 or i + 1 >= len(self.lines):
+            return []
+
+        return self.lines[i + 1:]
+
+    def replace_index(self, new_line, i, line = "Unknown"):
+        if i >= 0:
+            self._set_line(new_line, i)
+            print(f"[INFO] Replaced {line} with {new_line} in {self.path}")
+
+    def replace_line(self, new_line: str, *search_terms: str):
+        i, line = self.get_line(*search_terms)
+        self.replace_index(new_line, i, line)
+
+    def replace_or_add_index(self, new_line: str, i: int, line: str = "Unknown"):
+        """Replace line i, or append `new_line` if i is -1 (nothing was found)."""
+        if i >= 0:
+            self._set_line(new_line, i)
+            print(f"[INFO] Replaced {line} by {new_line} in {self.path}")
+        else:
+            self._append(new_line)
+            print(f"[INFO] Added {new_line} in {self.path}")
+
+    def replace_or_add(self, new_line: str, *search_terms: str):
+        i, line = self.get_line(*search_terms)
+        self.replace_or_add_index(new_line, i, line)
+
+    def replace_or_add_binding(self, new_line: str, command: str):
+        """Replace the binding line of `command`, or append `new_line` if it isn't bound yet."""
+        i, line = self.get_binding(command)
+        self.replace_or_add_index(new_line, i, line)
+
+    def remove_line(self, *search_terms):
+        self._delete_lines(self.index.matching([term.lower() for term in search_terms]))
+        self.edits.append(("remove", search_terms))
+        print(f"[INFO] Deleted lines containing {search_terms}")
+
+    def replace_term(self, term: str, newterm: str):
+        """
+        Replace all occurrences of `term` with `newterm`.
+        """
+        occurrences = 0
+        for idx in self.index._containing(term.lower()):
+            line = self.lines[idx]
+            if term in line:
+                occurrences += line.count(term)
+                self._patch_line(idx, line.replace(term, newterm))
+        if occurrences > 0:
+            self.edits.append(("replace_term", term, newterm))
+            print(f"[INFO] Replaced {occurrences} occurrences of '{term}' with '{newterm}' in {self.path}")
+        else:
+            print(f"[INFO] No occurrences of '{term}' found in {self.path}")
+
+    def delete_duplicates(self, term: str):
+        """
+        Search for lines containing `term` and delete duplicates, keeping only the first occurrence.
+        """
+        duplicates = [i for i in self.index._containing(term.lower()) if term in self.lines[i]][1:]
+        deleted = len(duplicates)
+        self._delete_lines(duplicates)
+        if deleted > 0:
+            self.edits.append(("delete_duplicates", term))
+            print(f"[INFO] Deleted {deleted} duplicate lines containing '{term}' in {self.path}, kept first occurrence")
+        else:
+            print(f"[INFO] No duplicate lines containing '{term}' found in {self.path}")
+
+    def apply_rules(self, rules: list):
+        """
+        Apply edit rules in a single pass over the file, with the same result as applying each rule
+        to the whole file in turn. Rules are ("replace_term", term, newterm), ("delete_duplicates", term)
+        and ("remove", search_terms), and behave like the methods of the same name.
+        """
+        self.refresh()
+        kept_first = set()  # delete_duplicates rules that already kept their first line
+        changed_lines = []
+        removed_lines = []
+        for position, line in enumerate(self.lines):
+            new_line = line
+            for i, (rule, *args) in enumerate(rules):
+                if rule == "replace_term":
+                    new_line = new_line.replace(args[0], args[1])
+                elif rule == "delete_duplicates" and args[0] in new_line:
+                    if i in kept_first:
+                        new_line = None
+                        break
+                    kept_first.add(i)
+                elif rule == "remove" and all(term.lower() in new_line.lower() for term in args[0]):
+                    new_line = None
+                    break
+
+            if new_line is None:
+                removed_lines.append(position)
+            elif new_line != line:
+                changed_lines.append((position, new_line))
+
+        changed, removed = len(changed_lines), len(removed_lines)
+        if changed or removed:
+            for position, new_line in changed_lines:
+                self._patch_line(position, new_line)
+            self._delete_lines(removed_lines)
+            self.edits.append(("rules", rules))
+            print(f"[INFO] {len(rules)} rules changed {changed} lines and removed {removed} lines in {self.path}")
+        else:
+            print(f"[INFO] {len(rules)} rules changed nothing in {self.path}")
+
+    def copy_file(self, other):
+        other.lines = list(self.lines)
+        other.write_lines()
+
+    def _record_sync(self, digest: str):
+        """Remember that the synced content is on disk, with the signature it was written with."""
+        if self.sync_digest is not None:
+            if self.sync_digest == digest:
+                File.synced[self.path] = (digest, self.signature)
+            self.sync_digest = None
+
+    def sync_file_with_old_patch(self):
+        """
+        Copy this file into the old patch, only if their contents differ.
+        Once synced, the old patch file isn't even read again until this file or the old patch file changes.
+        A sync is only recorded once the old patch file has been written successfully.
+        """
+        demo_path = os.path.join(self.__class__.demo_directory, self.local_path)
+        digest = self.digest()
+        synced = File.synced.get(demo_path)
+        if synced is not None and synced == (digest, _signature(demo_path)):
+            return
+
+        demo_file = File(demo_path, demo_file=True)
+        demo_file.sync_digest = digest
+        # What is on disk is compared too: lines left unsaved by a failed write don't count as synced
+        if demo_file.digest() != digest or demo_file.disk_digest != digest:
+            self.copy_file(demo_file)
+        else:
+            demo_file._record_sync(digest)
+
+    @classmethod
+    def sync_all_with_old_patch(cls):
+        for file in cls.files:
+            file.sync_file_with_old_patch()
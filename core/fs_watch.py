@@ -0,0 +1,199 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+
+class PollingWatcher:
+    """Fallback backend: assumes something may have changed every `interval` seconds."""
+
+    def __init__(self, root: str, recursive: bool = True, interval: float = 1.0):
+        self.root = root
+        self.interval = interval
+
+    def wait(self, timeout: float = None):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        return None
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux backend, reports the exact paths created, modified, moved or deleted."""
+    IN_MODIFY = 0x00000002
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, root: str, recursive: bool = True):
+        self.root = root
+        self.recursive = recursive
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}  # Watch descriptor -> directory path
+
+        try:
+            self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, path: str):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed on {path}")
+        self.watches[wd] = path
+
+    def _add_tree(self, path: str):
+        self._add_watch(path)
+        if self.recursive:
+            for dirpath, dirnames, _ in os.walk(path):
+                for name in dirnames:
+                    try:
+                        self._add_watch(os.path.join(dirpath, name))
+                    except OSError as e:
+                        if e.errno != errno.ENOENT:  # Already deleted again
+                            raise
+
+    def wait(self, timeout: float = None):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            overflow = self._parse(data, changed)
+            if overflow:
+                return None
+
+    def _parse(self, data: bytes, changed: set) -> bool:
+        """Add the paths of the events in `data` to `changed`. Returns True if events were lost."""
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            name = data[offset + self.EVENT.size: offset + self.EVENT.size + length].rstrip(b"\0")
+            offset += self.EVENT.size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                return True
+            if mask & self.IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            changed.add(path)
+
+            if self.recursive and mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                try:
+                    self._add_tree(path)
+                except OSError:
+                    pass  # Removed before it could be watched
+        return False
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class WindowsWatcher:
+    """Windows backend, signals that something changed in the tree without telling what."""
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x01
+    FILE_NOTIFY_CHANGE_DIR_NAME = 0x02
+    FILE_NOTIFY_CHANGE_SIZE = 0x08
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x10
+    WAIT_OBJECT_0 = 0x000
+    INFINITE = 0xFFFFFFFF
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    def __init__(self, root: str, recursive: bool = True):
+        from ctypes import wintypes
+
+        self.root = root
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        self.kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        self.kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        self.kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        self.kernel32.WaitForSingleObject.restype = wintypes.DWORD
+
+        notify_filter = (self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_DIR_NAME
+                         | self.FILE_NOTIFY_CHANGE_SIZE | self.FILE_NOTIFY_CHANGE_LAST_WRITE)
+        self.handle = self.kernel32.FindFirstChangeNotificationW(root, recursive, notify_filter)
+        if self.handle is None or self.handle == self.INVALID_HANDLE_VALUE:
+            self.handle = None
+            raise ctypes.WinError(ctypes.get_last_error())
+
+    def wait(self, timeout: float = None):
+        milliseconds = self.INFINITE if timeout is None else int(timeout * 1000)
+        if self.kernel32.WaitForSingleObject(self.handle, milliseconds) != self.WAIT_OBJECT_0:
+            return set()
+        self.kernel32.FindNextChangeNotification(self.handle)
+        return None
+
+    def close(self):
+        if self.handle is not None:
+            self.kernel32.FindCloseChangeNotification(self.handle)
+            self.handle = None
+
+
+def create_watcher(root: str, recursive: bool = True):
+    """
+    Return the best watcher available for this platform: inotify on Linux,
+    change notifications on Windows, polling everywhere else.
+    Watchers' wait(timeout) returns the set of paths that changed (empty on timeout),
+    or None when the backend can't tell which paths changed.
+    """
+    backend = {"linux": InotifyWatcher, "win32": WindowsWatcher}.get(sys.platform)
+    if backend is not None:
+        try:
+            return backend(root, recursive)
+        except (OSError, AttributeError) as e:
+            print(f"[WARN] Filesystem notifications unavailable ({e}), polling {root} instead")
+    return PollingWatcher(root, recursive)
+
+
+def wait_for_path(path: str, timeout: float = None) -> bool:
+    """
+    Block until `path` exists, watching its closest existing parent for new entries.
+    Returns False if `timeout` expired first.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not os.path.exists(path):
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return False
+
+        parent = os.path.dirname(os.path.abspath(path))
+        while not os.path.isdir(parent) and os.path.dirname(parent) != parent:
+            parent = os.path.dirname(parent)
+
+        # Wake up regularly anyway: the parent itself may be replaced
+        watcher = create_watcher(parent, recursive=False)
+        try:
+            watcher.wait(5.0 if remaining is None else min(remaining, 5.0))
+        finally:
+            watcher.close()
+    return True
@@ -0,0 +1,80 @@
+import os
+import subprocess
+from core.files import File
+from core.settings import Setting
+from core.mods import Mod, LWMod
+from core.bindings import Binding
+from core.paths import GAME_DIRECTORY, mod_source
+
+GAME_EXECUTABLE = os.path.join(GAME_DIRECTORY, "Binaries", "Win64", "Outlast2.exe")
+
+# Config files edited by the launcher, besides DefaultInput.ini (opened by Binding.init)
+CONFIG_FILES = {
+    "DefaultGame": os.path.join("OLGame", "Config", "DefaultGame.ini"),
+    "DefaultEngine": os.path.join("OLGame", "Config", "DefaultEngine.ini"),
+    "DefaultSystemSettings": os.path.join("OLGame", "Config", "DefaultSystemSettings.ini"),
+    "BaseEngine": os.path.join("Engine", "Config", "BaseEngine.ini"),
+    "BaseInput": os.path.join("Engine", "Config", "BaseInput.ini"),
+}
+
+mod_loader: Mod = None  # Created by setup()
+
+
+def config_file(name: str) -> File:
+    """:param name: One of CONFIG_FILES"""
+    return File(os.path.join(GAME_DIRECTORY, CONFIG_FILES[name]))
+
+
+def open_config_files():
+    """
+    Opens every config file the launcher edits. File.sync_all_with_old_patch only copies
+    the opened files, so the old patch gets the same settings and bindings as the latest patch.
+    """
+    if Binding.file is None:
+        Binding.init()
+    for name in CONFIG_FILES:
+        config_file(name)
+
+
+def setup():
+    """
+    Opens the config files, and creates the mods that can be selected when launching the latest patch
+    and the mod loader.
+    """
+    global mod_loader
+    if mod_loader is not None:
+        return
+
+    open_config_files()
+    default_game = config_file("DefaultGame")
+    stamina_off = Setting("StaminaOff",
+                          file=default_game,
+                          setting="StaminaMaxStamina=",
+                          enabled_value="-1", disabled_value="100")
+    sprint_delay_off = Setting("SprintDelayOff",
+                               file=default_game,
+                               setting="SprintDelay=",
+                               enabled_value="0", disabled_value="2")
+    LWMod.sprint_delay = Setting("SprintDelay",
+                                 file=default_game,
+                                 setting="SprintDelay=",
+                                 enabled_value="2", disabled_value="0")
+
+    LWMod("No CPK",
+          source_path=mod_source("No CPK"), install_path=os.path.join(GAME_DIRECTORY, "Mods"))
+    LWMod("No Stamina",
+          "", "",
+          stamina_off, sprint_delay_off)
+    LWMod("Cutscene Skip",
+          source_path=mod_source("Cutscene Skip"), install_path=os.path.join(GAME_DIRECTORY, "Mods"))
+
+    mod_loader = Mod("ModLoader",
+                     source_path=mod_source("ModLoader"),
+                     install_path=os.path.join(GAME_DIRECTORY, "Binaries", "Win64"))
+
+
+def launch_latest_patch():
+    """Installs the mod loader and starts the latest patch. Raises an OSError if the game couldn't be started."""
+    mod_loader.install()
+    subprocess.Popen(GAME_EXECUTABLE, shell=True)
+    print("Launching Outlast II...")
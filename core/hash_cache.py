@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import mmap
+import hashlib
+from core.atomic import atomic_write
+
+CHUNK_SIZE = 1024 * 1024
+MODS_HASHES = "hashes.json"  # Known-good hashes of the bundled mods, written at build time
+HASH_WORKERS = min(8, os.cpu_count() or 1)  # Files hashed at the same time by verification and dedupe
+
+
+def hash_stream(stream, algorithm: str = "sha256") -> str:
+    """Hash an opened binary stream."""
+    hasher = hashlib.new(algorithm)
+    while chunk := stream.read(CHUNK_SIZE):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def hash_file(path: str, algorithm: str = "sha256") -> str:
+    with open(path, "rb") as file:
+        return hash_stream(file, algorithm)
+
+
+def hash_mapped(path: str, algorithm: str = "sha256") -> str:
+    """
+    Hash a file through a memory map. Large buffers are hashed without holding the GIL,
+    so several files can be hashed in parallel from threads.
+    """
+    hasher = hashlib.new(algorithm)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return hasher.hexdigest()  # Empty files can't be mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for offset in range(0, len(view), CHUNK_SIZE):
+                    hasher.update(view[offset:offset + CHUNK_SIZE])
+    return hasher.hexdigest()
+
+
+class HashCache:
+    """
+    File hashes saved on disk and keyed by (path, size, mtime_ns),
+    so a file is only hashed again once it has changed.
+    """
+
+    def __init__(self, cache_file: str, algorithm: str = "sha256"):
+        self.cache_file = cache_file
+        self.algorithm = algorithm
+        self.entries = None  # Absolute path -> [size, mtime_ns, hash], loaded on first use
+        self.modified = False
+
+    def _load(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("algorithm") == self.algorithm:
+                self.entries = data.get("files", {})
+                return
+        except (OSError, ValueError, AttributeError):
+            pass
+        self.entries = {}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def cached(self, path: str, stat: os.stat_result):
+        """Return the saved hash of a file if it didn't change since, None otherwise."""
+        if self.entries is None:
+            self._load()
+        entry = self.entries.get(self._key(path))
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        return None
+
+    def store(self, path: str, stat: os.stat_result, digest: str):
+        """Remember the hash of a file, as it was when `stat` was taken."""
+        if self.entries is None:
+            self._load()
+        self.entries[self._key(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.modified = True
+
+    def get(self, path: str) -> str:
+        """Return the hash of a file, or "" if it can't be read."""
+        try:
+            stat = os.stat(path)
+            digest = self.cached(path, stat)
+            if digest is not None:
+                return digest
+            digest = hash_file(path, self.algorithm)
+        except OSError as e:
+            print(f"[ERROR] Couldn't calculate the hash of {path}: {e}")
+            return ""
+
+        self.store(path, stat, digest)
+        return digest
+
+    def save(self):
+        """Write the cache to disk if new hashes were calculated."""
+        if not self.modified:
+            return
+        try:
+            with atomic_write(self.cache_file) as file:
+                json.dump({"algorithm": self.algorithm, "files": self.entries}, file)
+            self.modified = False
+        except OSError as e:
+            print(f"[ERROR] Couldn't save the hash cache {self.cache_file}: {e}")
+
+
+def write_mods_hashes(mods_dir: str):
+    """Write the SHA-256 of every mod file to `mods_dir`/hashes.json (run before zipping the mods)."""
+    hashes = {}
+    for root, _, files in os.walk(mods_dir):
+        for file in files:
+            path = os.path.join(root, file)
+            rel_path = os.path.relpath(path, mods_dir).replace("\\", "/")
+            if rel_path != MODS_HASHES:
+                hashes[rel_path] = hash_file(path)
+
+    with open(os.path.join(mods_dir, MODS_HASHES), "w", encoding="utf-8") as file:
+        json.dump(hashes, file, indent=2, sort_keys=True)
+    print(f"Hashes of {len(hashes)} mod files written to {os.path.join(mods_dir, MODS_HASHES)}")
+
+
+if __name__ == "__main__":
+    write_mods_hashes(sys.argv[1] if len(sys.argv) > 1 else "Mods")
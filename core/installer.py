@@ -0,0 +1,44 @@
+import os
+from core.atomic import atomic_replace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MAX_WORKERS = 4  # Copies running at the same time
+
+
+def _copy_file(source, rel_path: str, dst: str):
+    """
+    Copy one file next to its destination, then swap it in.
+    A failed copy never leaves a half-written file at `dst`.
+    """
+    with atomic_replace(dst) as temp_path:
+        source.copy(rel_path, temp_path)
+
+
+def copy_files(source, rel_paths, install_path: str, progress=None, max_workers: int = MAX_WORKERS) -> list:
+    """
+    Copy files of a mod source into `install_path` through a bounded thread pool.
+
+    Destination folders are created once before copying. Sources pick the fastest copy they can:
+    OS-accelerated copy for folders, large-buffer streaming for zip members.
+    :param progress: Called as progress(done, total, rel_path) after each file, from the calling thread
+    :return: List of (rel_path, exception) for the files that could not be copied
+    """
+    jobs = [(rel_path, os.path.join(install_path, rel_path)) for rel_path in rel_paths]
+    if not jobs:
+        return []
+
+    for directory in {os.path.dirname(dst) for _, dst in jobs}:
+        os.makedirs(directory, exist_ok=True)
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        futures = {pool.submit(_copy_file, source, rel_path, dst): rel_path for rel_path, dst in jobs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            rel_path = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failed.append((rel_path, e))
+            if progress:
+                progress(done, len(jobs), rel_path)
+    return failed
@@ -0,0 +1,90 @@
+import os
+import shutil
+from core.files import File
+from core.paths import GAME_DIRECTORY
+
+DEFAULT_INPUT = "OLGame/Config/DefaultInput.ini"
+
+
+class Migration:
+    """Changes needed when updating from a launcher version older than `version`."""
+
+    def __init__(self, version: str, rules: dict = None, steps: tuple = ()):
+        """
+        :param rules: Config file path, relative to the game directory -> edit rules (see File.apply_rules)
+        :param steps: Other changes, called with the updater once the rules are applied
+        """
+        self.version = version
+        self.rules = rules or {}
+        self.steps = steps
+
+
+def clear_mods_folder(updater):
+    """Mods used to be installed in their own folders, they are now copied to Mods directly."""
+    mods_dir = os.path.join(GAME_DIRECTORY, "Mods")
+    if not os.path.isdir(mods_dir):
+        return
+    for entry in os.listdir(mods_dir):
+        full_path = os.path.join(mods_dir, entry)
+        if os.path.isdir(full_path):
+            shutil.rmtree(full_path)
+            print(f"Deleted : {full_path}")
+
+
+def reinstall_speedrun_helper(updater):
+    speedrun_helper = updater.get("SpeedrunHelper")
+    speedrun_helper.uninstall()
+    speedrun_helper.install()
+
+
+# In version order. Migrations are recorded in the [Migrations] section of the launcher config once applied
+MIGRATIONS = [
+    Migration("1.1.0", steps=(clear_mods_folder,)),
+    Migration("1.1.3", rules={DEFAULT_INPUT: [
+        ("replace_term", "OL_USE", "OLA_USE"),
+        ("delete_duplicates", "setbind LeftMouseButton OLA_USE | setbind"),
+        ("replace_term", "ToggleGodMode", "GodMode"),
+        ("replace_term", "ToggleFreeCam", "FreeCam"),
+    ]}),
+    Migration("1.3.0", rules={DEFAULT_INPUT: [
+        ("remove", ("DisplayAll OLHero Location",)),
+        ("remove", ("DisplayALL OLHero Velocity",)),
+    ]}),
+    Migration("1.3.4", steps=(reinstall_speedrun_helper,)),
+]
+
+
+def _apply_rules(rules: dict):
+    """Apply merged rules in a single pass over each file, then write each file once."""
+    with File.batch():
+        for local_path, file_rules in rules.items():
+            file = File(os.path.join(GAME_DIRECTORY, *local_path.split("/")))
+            file.apply_rules(file_rules)
+            file.write_lines()
+
+
+def apply_migrations(migrations: list, updater):
+    """
+    Apply migrations in version order, the rules of each one before its steps, like updating
+    one version at a time would. The rules of consecutive migrations are merged per file and applied
+    in a single pass, which is flushed before the steps of the next migration that has some.
+    """
+    rules = {}
+    merged = []  # Migrations whose rules are waiting in `rules`
+    for migration in migrations:
+        for local_path, file_rules in migration.rules.items():
+            rules.setdefault(local_path, []).extend(file_rules)
+        merged.append(migration)
+        if not migration.steps:
+            continue
+
+        _apply_rules(rules)
+        for step in migration.steps:
+            step(updater)
+        for applied in merged:
+            print(f"[INFO] Applied the {applied.version} migration")
+        rules, merged = {}, []
+
+    _apply_rules(rules)
+    for applied in merged:
+        print(f"[INFO] Applied the {applied.version} migration")
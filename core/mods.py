@@ -0,0 +1,209 @@
+import os
+from core.settings import Setting
+from core.sources import as_source
+from core.installer import copy_files
+from core.hash_cache import HashCache, hash_file
+
+
+class Mod:
+    """
+    Represents a mod with optional source and install paths. Settings can be tied to the mod.
+    This class manages installation. Child classes manage GUI and additional logic.
+    """
+
+    def __init__(self, name: str, source_path, install_path: str, *settings: Setting):
+        """
+        :param source_path: Mod files, as a folder path or a source from `sources` (optional)
+        :param install_path: Destination folder in game (optional)
+        """
+        self.name = name
+        self.source = as_source(source_path)
+        self.install_path = install_path
+        self.settings = settings
+
+    # --- Internal utils ---
+
+    def _iter_source_files(self):
+        """Yield the relative path of each file in the source."""
+        if not self.source or not self.source.exists():
+            return  # silently skip if no source
+        yield from self.source.iter_files()
+
+    # --- Core operations ---
+
+    def install(self, progress=None):
+        """
+        Install all files from the source to install_path and enable settings.
+        Files already up to date in install_path are not copied again.
+        :param progress: Called as progress(done, total, rel_path) after each copied file
+        """
+        print(f"[INFO] Installing mod '{self.name}'...")
+
+        # Copy files only if paths are defined
+        if self.source and self.install_path:
+            if not self.source.exists():
+                print(f"[WARN] Source '{self.source}' not found.")
+            else:
+                rel_paths = [rel_path for rel_path in self._iter_source_files()
+                             if not self.source.is_up_to_date(rel_path, os.path.join(self.install_path, rel_path))]
+                if not rel_paths:
+                    print(f"[INFO] Files of '{self.name}' are already up to date")
+
+                failed = dict(copy_files(self.source, rel_paths, self.install_path, progress))
+                for rel_path in rel_paths:
+                    if rel_path in failed:
+                        print(f"[ERROR] Could not copy '{rel_path}' from '{self.source}': {failed[rel_path]}")
+                    else:
+                        print(f"[INFO] Copied '{rel_path}'")
+
+        # Enable all related settings
+        for s in self.settings:
+            s.enable()
+
+    def uninstall(self):
+        """Remove files corresponding to the source and disable settings. Does nothing if the mod isn't installed."""
+        if self.source and self.install_path and not self.source.exists():
+            print(f"[WARN] Source '{self.source}' not found.")
+
+        installed = []
+        if self.source and self.install_path:
+            for rel_path in self._iter_source_files():
+                dst = os.path.join(self.install_path, rel_path)
+                if os.path.exists(dst):
+                    installed.append((rel_path, dst))
+
+        if not installed and not any(s.is_enabled() for s in self.settings):
+            return
+
+        print(f"[INFO] Uninstalling mod '{self.name}'...")
+
+        # Remove only the files that are present
+        for rel_path, dst in installed:
+            try:
+                os.remove(dst)
+                print(f"[INFO] Removed '{rel_path}'")
+            except Exception as e:
+                print(f"[ERROR] Could not remove '{dst}': {e}")
+
+        # Disable all related settings
+        for s in self.settings:
+            s.disable()
+
+    def is_installed(self) -> bool:
+        """Return True if all source files exist in the install directory and all settings are enabled."""
+        if self.source and self.install_path:
+            for rel_path in self._iter_source_files():
+                dst = os.path.join(self.install_path, rel_path)
+                if not os.path.exists(dst):
+                    return False
+
+        # Check all settings are enabled
+        for s in self.settings:
+            if not s.is_enabled():
+                return False
+
+        return True
+
+    def toggle(self):
+        """Toggle the mod on/off depending on installation state."""
+        if self.is_installed():
+            self.uninstall()
+        else:
+            self.install()
+
+
+class LWMod(Mod):
+    """Mod selected for a launch of the latest patch. Only the selected ones are installed when launching."""
+    lw_mods = []
+    sprint_delay = None
+
+    def __init__(self, name, source_path, install_path, *settings):
+        super().__init__(name, source_path, install_path, *settings)
+        self.__class__.lw_mods.append(self)
+
+    @classmethod
+    def prepare_launch(cls, selected_mods):
+        """
+        Uninstall the mods that are not selected, then install the selected ones.
+        :param selected_mods: Names of the selected mods
+        """
+        for mod in cls.lw_mods:
+            if not mod.name in selected_mods:
+                mod.uninstall()
+        for mod in cls.lw_mods:
+            if mod.name in selected_mods:
+                mod.install()
+
+        if "No CPK" in selected_mods:
+            cls.sprint_delay.enable()
+
+
+class ReplacementMod:
+    """Mod that works by replacing an existing files. The original copy of the files needs to be provided."""
+
+    def __init__(self, name: str, mod_source_path, original_source_path, install_path: str, *settings,
+                 hash_cache: HashCache = None):
+        """
+        :param hash_cache: Persistent cache of the installed files' hashes (optional)
+        """
+        self.mod_source = Mod(f"modded_{name}", mod_source_path, install_path)
+        self.original_source = Mod(f"original_{name}", original_source_path, install_path)
+
+        self.name = name
+        self.settings = settings
+        self.hash_cache = hash_cache
+
+    def _calculate_file_hash(self, filepath: str) -> str:
+        """Calculates the SHA256 hash of an installed file, using the hash cache if there is one."""
+        if not os.path.isfile(filepath):
+            return ""
+        if self.hash_cache is not None:
+            return self.hash_cache.get(filepath)
+        try:
+            return hash_file(filepath)
+        except OSError:
+            print(f"[Error] Couldn't calculate the hash of {filepath}")
+            return ""
+
+    def install(self):
+        """Copies modded files and enables settings."""
+        print(f"[INFO] Installing replacement mod '{self.name}'...")
+        self.mod_source.install()
+        for s in self.settings:
+            s.enable()
+
+    def uninstall(self):
+        """Restores original files and disables settings."""
+        print(f"[INFO] Uninstalling replacement mod '{self.name}'...")
+        self.original_source.install()
+        for s in self.settings:
+            s.disable()
+
+    def is_installed(self) -> bool:
+        """
+        Returns True if the installed file matches the MODDED file (verified via hash)
+        AND if all settings are enabled.
+        """
+        try:
+            return self._files_match() and all(s.is_enabled() for s in self.settings)
+        finally:
+            if self.hash_cache is not None:
+                self.hash_cache.save()
+
+    def _files_match(self) -> bool:
+        if self.mod_source.source and self.mod_source.install_path:
+
+            for rel_path in self.mod_source._iter_source_files():
+                dst_installed_path = os.path.join(self.mod_source.install_path, rel_path)
+
+                if not os.path.exists(dst_installed_path):
+                    return False
+
+                hash_source = self.mod_source.source.sha256(rel_path, self.hash_cache)
+                hash_installed = self._calculate_file_hash(dst_installed_path)
+
+                # Check for hash match
+                if not hash_source or hash_source != hash_installed:
+                    return False
+
+        return True
@@ -0,0 +1,79 @@
+import os
+import subprocess
+import configparser
+from core.files import File
+from core.settings import Setting
+from core.paths import CONFIG_FILE
+from core.depot_manifest import APP_ID, DEPOT_ID
+
+# Default Steam content folder path
+STEAM_CONTENT_PATH = rf"C:\Program Files (x86)\Steam\steamapps\content\app_{APP_ID}\depot_{DEPOT_ID}"
+
+
+class OldPatch:
+    """Location of the Old Patch folder, saved in the launcher config, and its launch procedure."""
+    CONFIG_SECTION = "OldPatch"
+
+    def __init__(self, save: bool = True):
+        """:param save: Save the detected path in the config file, if no path was saved yet"""
+        # Open the config file
+        self.config_file = CONFIG_FILE
+        self.config = configparser.ConfigParser()
+        self.config.read(self.config_file)
+        if not self.config.has_section(OldPatch.CONFIG_SECTION):
+            self.config.add_section(OldPatch.CONFIG_SECTION)
+
+        # Load the saved path (default is empty)
+        self.path = self.config.get(OldPatch.CONFIG_SECTION, "Path", fallback="")
+        if not self.path:
+            self.detect_path(save)
+
+    def save_path(self):
+        self.config.set(OldPatch.CONFIG_SECTION, "Path", self.path)
+        with open(self.config_file, "w") as f:
+            self.config.write(f)
+        print(f"Old Patch path saved: {self.path}")
+
+    @staticmethod
+    def is_valid_old_patch(path):
+        """Checks if the provided path is structured like an OL2 folder."""
+        if path and os.path.isdir(path):
+            bat_file_path = os.path.join(path, "Outlast2.bat")
+            if not os.path.isfile(bat_file_path):
+                return False
+            required_dirs = ["OLGame", "BInaries", "Engine"]
+            for directory in required_dirs:
+                if not os.path.isdir(os.path.join(path, directory)):
+                    return False
+            return True
+        return False
+
+    def detect_path(self, save: bool = True):
+        """Detects the old patch path in the default downloading spot"""
+        # Supposons que le répertoire courant est "steamapps/common/Outlast 2"
+        steamapps_dir = os.path.abspath(os.path.join(os.getcwd(), "../.."))
+        patch_path = os.path.join(steamapps_dir, "content", f"app_{APP_ID}", f"depot_{DEPOT_ID}")
+
+        self.path = patch_path if self.is_valid_old_patch(patch_path) else ""
+        if save:
+            self.save_path()
+
+    def is_ready(self) -> bool:
+        """True if the Old Patch folder is defined and valid"""
+        return bool(self.path) and self.is_valid_old_patch(self.path)
+
+    def launch(self):
+        """
+        Syncs the config of the Old Patch with the latest patch, then starts it.
+        Raises an OSError if the game couldn't be started. Check is_ready() first.
+        """
+        with File.batch():
+            File.demo_directory = self.path
+            File.sync_all_with_old_patch()
+            demo_steam = Setting(name="Demo Steam",
+                                 file=File(os.path.join(self.path, "OLGame", "Config", "DefaultEngine.ini"), demo_file=True),
+                                 setting="bRelaunchInSteam=")
+            demo_steam.disable()
+
+        subprocess.Popen(os.path.join(self.path, "Binaries", "Win64", "Outlast2.exe"))
+        print("Old Patch launched successfully.")
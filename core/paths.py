@@ -0,0 +1,67 @@
+import sys
+import os
+import ctypes
+from core.errors import report_error
+from core.sources import DirectorySource, ZipSource
+
+# ---------------------------------------------------------------------------
+#  PyInstaller runtime paths
+# ---------------------------------------------------------------------------
+if getattr(sys, "frozen", False):                 # Running as a PyInstaller bundle
+    BASE_PATH = sys._MEIPASS                     # Folder where data files are unpacked
+else:                                             # Development run: data files are in the repo
+    BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ---------------------------------------------------------------------------
+#  Main Paths
+# ---------------------------------------------------------------------------
+GAME_DIRECTORY = os.getcwd()
+CONFIG_FILE = "LauncherConfig.ini"
+HASH_CACHE_FILE = "LauncherHashes.json"  # Hashes of installed files, stored next to the config
+RELEASE_CACHE_FILE = "LauncherReleases.json"  # Last GitHub release answers, for conditional requests
+OLD_PATCH_HASHES = "OldPatchHashes.json"  # SHA-1 of the old patch files, checkpointed while verifying
+OL2_ICON = os.path.join(BASE_PATH, "OutlastII_icon.png")
+OLD_PATCH_MANIFEST = os.path.join(BASE_PATH, "OldPatchManifest.json")  # Optional, see depot_manifest.py
+MODS_DIR = os.path.join(BASE_PATH, "Mods")    # Mods folder of the repo, used by development runs
+MODS_ZIP = os.path.join(BASE_PATH, "Mods.zip")
+
+# ---------------------------------------------------------------------------
+#  Helpers
+# ---------------------------------------------------------------------------
+
+
+def init() -> bool:
+    """
+    Prepare the launcher process, once at startup (importing this module has no side effect).
+    Returns False if the launcher isn't in the Outlast II folder.
+    """
+    # PyInstaller BS I have no idea how it works but this saved my life (lany the goat)
+    if getattr(sys, "frozen", False) and sys.platform == "win32":
+        ctypes.windll.kernel32.SetDllDirectoryW(None)
+    return check_game_folder()
+
+
+def check_game_folder() -> bool:
+    """Verify that the launcher is located in the OutlastII folder."""
+    required = ["OLGame", "Binaries", "Engine"]
+    missing  = [f for f in required if not os.path.exists(os.path.join(GAME_DIRECTORY, f))]
+
+    if missing:
+        report_error(
+            "The launcher is not in the correct directory.\n"
+            "Place it inside the Outlast 2 folder."
+        )
+        return False
+    return True
+
+
+def mod_source(folder: str):
+    """
+    Return the source of the bundled mod stored in `folder`.
+    Development runs read the repo's Mods folder directly. Bundled builds stream the files
+    out of Mods.zip.
+    The game's own Mods folder is where mods get installed, it is never used as a source.
+    """
+    if not getattr(sys, "frozen", False):
+        return DirectorySource(os.path.join(MODS_DIR, folder))
+    return ZipSource(MODS_ZIP, folder)
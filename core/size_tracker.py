@@ -0,0 +1,165 @@
+import os
+
+
+class _DirState:
+    """What a tracked directory contained the last time it was scanned."""
+
+    def __init__(self, mtime_ns: int, files: dict, subdirs: list):
+        self.mtime_ns = mtime_ns
+        self.files = files      # File name -> size
+        self.subdirs = subdirs  # Subdirectory names
+        self.size = sum(files.values())
+
+
+class FolderSizeTracker:
+    """
+    Keeps the total size of a folder tree up to date without walking it on every poll.
+
+    Directory listings and file sizes are cached. An update only re-scans directories whose
+    mtime changed (entries were created, deleted or renamed) and re-stats the files that grew
+    recently, since a file being written doesn't change its directory's mtime.
+    A full re-scan every `full_scan_every` updates catches anything else.
+    """
+
+    def __init__(self, root: str, full_scan_every: int = 60, hot_updates: int = 10):
+        self.root = root
+        self.full_scan_every = full_scan_every
+        self.hot_updates = hot_updates  # Updates a file keeps being re-statted after it last grew
+        self.dirs = {}  # Directory path -> _DirState
+        self.hot = {}   # File path -> (directory path, file name, updates left)
+        self.total = 0
+        self.updates = 0
+
+    def update(self, changed_paths: set = None) -> int:
+        """
+        Bring the total up to date and return it, in bytes.
+        :param changed_paths: Paths reported by a filesystem watcher (see fs_watch). Only those are
+                              looked at instead of the whole tree. None means they are unknown.
+        """
+        if changed_paths is not None and self.root in self.dirs:
+            for path in changed_paths:
+                self._apply_change(path)
+            return self.total
+
+        self.updates += 1
+        full_scan = self.updates % self.full_scan_every == 0
+        if not os.path.isdir(self.root):
+            self._forget(self.root)
+            self.hot.clear()
+            return self.total
+
+        self._visit(self.root, full_scan)
+        self._restat_hot_files()
+        return self.total
+
+    def file_size(self, path: str):
+        """Last known size of a file of the tree, None if it wasn't seen."""
+        state = self.dirs.get(os.path.dirname(path))
+        return state.files.get(os.path.basename(path)) if state else None
+
+    def _visit(self, path: str, full_scan: bool):
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self._forget(path)
+            return
+
+        state = self.dirs.get(path)
+        if full_scan or state is None or state.mtime_ns != mtime_ns:
+            state = self._scan(path, mtime_ns, state)
+
+        for name in state.subdirs:
+            self._visit(os.path.join(path, name), full_scan)
+
+    def _scan(self, path: str, mtime_ns: int, old_state: _DirState) -> _DirState:
+        """List a directory again, updating the total and marking new or resized files as hot."""
+        files, subdirs = {}, []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            files[entry.name] = entry.stat(follow_symlinks=False).st_size
+                    except OSError as e:
+                        print(f"Error on {entry.path}: {e}")
+        except OSError as e:
+            print(f"Error on {path}: {e}")
+
+        old_files = old_state.files if old_state else {}
+        for name, size in files.items():
+            if old_files.get(name) != size:
+                self.hot[os.path.join(path, name)] = (path, name, self.hot_updates)
+        for name in old_files.keys() - files.keys():
+            self.hot.pop(os.path.join(path, name), None)
+        if old_state:
+            for name in set(old_state.subdirs) - set(subdirs):
+                self._forget(os.path.join(path, name))
+
+        state = _DirState(mtime_ns, files, subdirs)
+        self.total += state.size - (old_state.size if old_state else 0)
+        self.dirs[path] = state
+        return state
+
+    def _apply_change(self, path: str):
+        """Account for a single path reported as created, modified, moved or deleted."""
+        parent, name = os.path.split(path)
+        state = self.dirs.get(parent)
+        if state is None:
+            if path in self.dirs and not os.path.isdir(path):
+                self._forget(path)  # The watched root itself
+            return
+
+        if name in state.files:
+            try:
+                size = os.stat(path).st_size
+                if os.path.isfile(path):
+                    self.total += size - state.files[name]
+                    state.size += size - state.files[name]
+                    state.files[name] = size
+                    return
+            except OSError:
+                pass
+
+        # Created, deleted or renamed: list the parent again, and scan new subdirectories
+        try:
+            state = self._scan(parent, os.stat(parent).st_mtime_ns, state)
+        except OSError:
+            self._forget(parent)
+            return
+        if name in state.subdirs:
+            self._visit(path, full_scan=False)
+
+    def _forget(self, path: str):
+        """Drop a directory that disappeared, and everything below it."""
+        state = self.dirs.pop(path, None)
+        if state is None:
+            return
+        self.total -= state.size
+        for name in state.files:
+            self.hot.pop(os.path.join(path, name), None)
+        for name in state.subdirs:
+            self._forget(os.path.join(path, name))
+
+    def _restat_hot_files(self):
+        for file_path, (dir_path, name, updates_left) in list(self.hot.items()):
+            state = self.dirs.get(dir_path)
+            try:
+                size = os.stat(file_path).st_size
+            except OSError:
+                size = None
+
+            if state is None or size is None or name not in state.files:
+                del self.hot[file_path]  # Removed: the next scan of its directory accounts for it
+                continue
+
+            if size != state.files[name]:
+                self.total += size - state.files[name]
+                state.size += size - state.files[name]
+                state.files[name] = size
+                self.hot[file_path] = (dir_path, name, self.hot_updates)
+            elif updates_left <= 1:
+                del self.hot[file_path]
+            else:
+                self.hot[file_path] = (dir_path, name, updates_left - 1)
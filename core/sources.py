@@ -0,0 +1,205 @@
+import os
+import time
+import zlib
+import shutil
+import json
+import hashlib
+import zipfile
+from core.hash_cache import MODS_HASHES, hash_file, hash_stream
+
+COPY_BUFFER_SIZE = 1024 * 1024  # Buffer used when streaming zip members to disk
+MTIME_TOLERANCE = 2  # Seconds, zip timestamps and FAT file systems have a 2 s resolution
+
+
+def _read_chunks(path: str):
+    with open(path, "rb") as file:
+        while chunk := file.read(COPY_BUFFER_SIZE):
+            yield chunk
+
+
+def _stat_or_none(path: str):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+class DirectorySource:
+    """Mod files read from a folder on disk (the repo's Mods folder)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __str__(self):
+        return self.path
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.path)
+
+    def iter_files(self):
+        """Yield the relative path ("/" separated) of every file in the source."""
+        if not self.exists():
+            return
+        for root, _, files in os.walk(self.path):
+            for file in files:
+                rel_path = os.path.relpath(os.path.join(root, file), self.path)
+                yield rel_path.replace("\\", "/")
+
+    def open(self, rel_path: str):
+        """Open a source file for binary reading."""
+        return open(os.path.join(self.path, rel_path), "rb")
+
+    def copy(self, rel_path: str, dst: str):
+        """Copy a source file to `dst`, keeping its metadata."""
+        shutil.copy2(os.path.join(self.path, rel_path), dst)
+
+    def is_up_to_date(self, rel_path: str, dst: str) -> bool:
+        """
+        True if `dst` already holds this file.
+        Same size and mtime is trusted (copy2 keeps the mtime), otherwise the contents are hashed.
+        """
+        src = os.path.join(self.path, rel_path)
+        src_stat, dst_stat = _stat_or_none(src), _stat_or_none(dst)
+        if src_stat is None or dst_stat is None or src_stat.st_size != dst_stat.st_size:
+            return False
+        if abs(src_stat.st_mtime - dst_stat.st_mtime) < MTIME_TOLERANCE:
+            return True
+
+        src_hash, dst_hash = hashlib.sha256(), hashlib.sha256()
+        for chunk in _read_chunks(src):
+            src_hash.update(chunk)
+        for chunk in _read_chunks(dst):
+            dst_hash.update(chunk)
+        if src_hash.digest() != dst_hash.digest():
+            return False
+        os.utime(dst, (dst_stat.st_atime, src_stat.st_mtime))  # Next check takes the fast path
+        return True
+
+    def sha256(self, rel_path: str, hash_cache=None) -> str:
+        """SHA-256 of a source file, looked up in `hash_cache` if one is given. Returns "" on failure."""
+        path = os.path.join(self.path, rel_path)
+        if hash_cache is not None:
+            return hash_cache.get(path)
+        try:
+            return hash_file(path)
+        except OSError as e:
+            print(f"[ERROR] Couldn't calculate the hash of {path}: {e}")
+            return ""
+
+
+class ZipSource:
+    """
+    Mod files read straight out of a folder inside a zip archive (the bundled Mods.zip).
+    Members are streamed to their destination, nothing is extracted to a temporary folder.
+    """
+    _archives = {}  # Opened archives, shared by all the sources of the same zip
+    _hashes = {}    # Zip path -> {member: sha256}, from the hashes.json written at build time
+
+    def __init__(self, zip_path: str, folder: str):
+        self.zip_path = zip_path
+        self.folder = folder.replace("\\", "/").strip("/")
+        self._members = None
+
+    def __str__(self):
+        return f"{self.zip_path}/{self.folder}"
+
+    def _archive(self) -> zipfile.ZipFile:
+        archive = self.__class__._archives.get(self.zip_path)
+        if archive is None:
+            archive = zipfile.ZipFile(self.zip_path, "r")
+            self.__class__._archives[self.zip_path] = archive
+        return archive
+
+    def members(self) -> dict:
+        """Return {relative_path: ZipInfo} for every file of the folder."""
+        if self._members is None:
+            self._members = {}
+            if os.path.isfile(self.zip_path):
+                prefix = f"{self.folder}/"
+                for info in self._archive().infolist():
+                    # Compress-Archive may store entries with Windows separators
+                    name = info.filename.replace("\\", "/")
+                    if name.startswith(prefix) and not name.endswith("/"):
+                        self._members[name[len(prefix):]] = info
+        return self._members
+
+    def exists(self) -> bool:
+        return bool(self.members())
+
+    def iter_files(self):
+        """Yield the relative path ("/" separated) of every file in the source."""
+        yield from self.members()
+
+    def open(self, rel_path: str):
+        """Open a member for binary reading."""
+        return self._archive().open(self.members()[rel_path])
+
+    def copy(self, rel_path: str, dst: str):
+        """Stream a member to `dst` and give it the member's modification time."""
+        info = self.members()[rel_path]
+        with self._archive().open(info) as src, open(dst, "wb") as out:
+            shutil.copyfileobj(src, out, COPY_BUFFER_SIZE)
+        mtime = zip_mtime(info)
+        os.utime(dst, (mtime, mtime))
+
+    def is_up_to_date(self, rel_path: str, dst: str) -> bool:
+        """
+        True if `dst` already holds this member.
+        Same size and mtime is trusted, otherwise the CRC of `dst` is compared to the one stored in the zip.
+        """
+        info = self.members()[rel_path]
+        dst_stat = _stat_or_none(dst)
+        if dst_stat is None or dst_stat.st_size != info.file_size:
+            return False
+        mtime = zip_mtime(info)
+        if abs(dst_stat.st_mtime - mtime) < MTIME_TOLERANCE:
+            return True
+
+        crc = 0
+        for chunk in _read_chunks(dst):
+            crc = zlib.crc32(chunk, crc)
+        if crc != info.CRC:
+            return False
+        os.utime(dst, (dst_stat.st_atime, mtime))  # Next check takes the fast path
+        return True
+
+    def _known_hashes(self) -> dict:
+        hashes = self.__class__._hashes.get(self.zip_path)
+        if hashes is None:
+            try:
+                with self._archive().open(MODS_HASHES) as file:
+                    hashes = json.load(file)
+            except (KeyError, ValueError, OSError):
+                hashes = {}
+            self.__class__._hashes[self.zip_path] = hashes
+        return hashes
+
+    def sha256(self, rel_path: str, hash_cache=None) -> str:
+        """
+        SHA-256 of a member, precomputed at build time. Members missing from hashes.json
+        are hashed once per session. Returns "" on failure.
+        """
+        name = f"{self.folder}/{rel_path}"
+        hashes = self._known_hashes()
+        if name not in hashes:
+            try:
+                with self.open(rel_path) as file:
+                    hashes[name] = hash_stream(file)
+            except (KeyError, OSError, zipfile.BadZipFile) as e:
+                print(f"[ERROR] Couldn't calculate the hash of {name} in {self.zip_path}: {e}")
+                return ""
+        return hashes[name]
+
+
+def zip_mtime(info: zipfile.ZipInfo) -> float:
+    """Timestamp of a zip member (zip dates are stored in local time)."""
+    return time.mktime(info.date_time + (0, 0, -1))
+
+
+def as_source(source):
+    """Accept a folder path or a source object. Empty values mean the mod has no files."""
+    if not source:
+        return None
+    if isinstance(source, str):
+        return DirectorySource(source)
+    return source
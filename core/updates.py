@@ -0,0 +1,488 @@
+import requests
+import urllib3
+import os
+import glob
+import sys
+import json
+import time
+from core.atomic import atomic_write
+import threading
+import subprocess
+import textwrap
+import configparser
+from core.migrations import MIGRATIONS, apply_migrations
+from core.hash_cache import hash_file
+from core.delta import apply_patch, PatchError
+from core.paths import CONFIG_FILE, RELEASE_CACHE_FILE
+
+REQUEST_TIMEOUT = (3, 5)    # Seconds to connect to GitHub, and between two received bytes
+MIN_CHUNK_SIZE = 64 * 1024        # Bytes read at once when downloading, adapted to the connection speed
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+DOWNLOAD_RETRIES = 5              # Times a dropped download is resumed before giving up
+DEFAULT_CHECK_INTERVAL = 0  # Minutes during which the last answer of GitHub is reused, see [Update] check_interval.
+# 0 revalidates the answer on every start, which only costs a "304 Not Modified" when nothing was released
+
+
+def version_to_number(version):
+    """
+    Converts a version string in the format x.y.z into a number 00x00y00z (zero-padded).
+    """
+    try:
+        major, minor, patch = map(int, version.split('.'))
+        major_str = f"{major:03d}"
+        minor_str = f"{minor:03d}"
+        patch_str = f"{patch:03d}"
+        version_number = int(major_str + minor_str + patch_str)
+        return version_number
+    except ValueError:
+        raise ValueError("Invalid version format. Expected format 'x.y.z'")
+
+class ReleaseCache:
+    """
+    GitHub API answers saved on disk with their ETag and Last-Modified headers.
+    Answers younger than the check interval (none by default) are reused as is, older ones are revalidated with a
+    conditional request (a "304 Not Modified" doesn't count against the API rate limit),
+    and they are still used when GitHub can't be reached.
+    """
+
+    def __init__(self, cache_file: str, session: requests.Session, check_interval: float):
+        """
+        :param check_interval: Minimum time between two requests to the same URL, in seconds
+        """
+        self.cache_file = cache_file
+        self.session = session
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        try:
+            with open(cache_file, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.responses = data["responses"]
+            self.notes = data["notes"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.responses = {}  # URL -> {"etag", "last_modified", "checked", "data"}
+            self.notes = {}      # Tag -> release notes
+
+    def save(self):
+        with self.lock:
+            data = {"responses": self.responses, "notes": self.notes}
+        try:
+            with atomic_write(self.cache_file) as file:
+                json.dump(data, file)
+        except OSError as e:
+            print(f"[WARN] Couldn't save the release cache: {e}")
+
+    def get_json(self, url: str):
+        """
+        Return the JSON answer of `url`, from the cache when it is recent or still valid.
+        Raises requests.RequestException if it can't be fetched and was never cached.
+        """
+        with self.lock:
+            cached = self.responses.get(url)
+        if cached and time.time() - cached["checked"] < self.check_interval:
+            return cached["data"]
+
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 304 and cached:
+                data = cached["data"]
+            else:
+                response.raise_for_status()
+                data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            if cached:
+                print(f"[WARN] Couldn't reach GitHub ({e}), using the cached release information")
+                return cached["data"]
+            raise requests.RequestException(e)
+
+        with self.lock:
+            self.responses[url] = {
+                "etag": response.headers.get("ETag", cached.get("etag") if cached else None),
+                "last_modified": response.headers.get("Last-Modified", cached.get("last_modified") if cached else None),
+                "checked": time.time(),
+                "data": data,
+            }
+        self.save()
+        return data
+
+    def remember_notes(self, release: dict):
+        """Keep the release notes of a release, so its changelog can be shown offline."""
+        body = release.get("body") or ""
+        with self.lock:
+            changed = self.notes.get(release["tag_name"]) != body
+            self.notes[release["tag_name"]] = body
+        if changed:
+            self.save()
+
+
+class LauncherUpdater:
+    def __init__(self, current_version, github_releases_api_url, executable_name):
+        self.current_version = current_version
+        self.github_releases_api_url = github_releases_api_url
+        self.executable_name = executable_name
+        self.config_file = CONFIG_FILE
+        self.objects = {}
+
+        self._load_old_version()
+        # Delta patch from this version to a release, see delta.py
+        self.patch_name = f"{os.path.splitext(executable_name)[0]}-{current_version}.delta"
+        self.patch_asset = None
+
+        # One pooled connection to GitHub for every updater request
+        self.session = requests.Session()
+        self.session.headers.update({"Accept": "application/vnd.github+json",
+                                     "User-Agent": executable_name})
+        self.releases = ReleaseCache(RELEASE_CACHE_FILE, self.session, self.check_interval * 60)
+
+    def register(self, name, obj):
+        """
+        Registers an object in the updater's context so it can be accessed during update operations.
+        """
+        self.objects[name] = obj
+
+    def get(self, name):
+        """
+        Retrieves an object from the registry, or None if it doesn't exist.
+        """
+        return self.objects.get(name)
+
+    def _load_old_version(self) -> None:
+        """
+        Populate self.old_version with the value stored under
+        [Update] version in the config file.  Leaves it to None if the
+        file/section/key doesn't exist.
+        Also reads [Update] check_interval, the minutes between two requests to GitHub,
+        and the migrations already applied from [Migrations].
+        """
+        config = configparser.ConfigParser()
+
+        self.check_interval = DEFAULT_CHECK_INTERVAL
+        self.applied_migrations = set()
+        if not os.path.exists(self.config_file):
+            self.old_version = None  # fichier absent
+            return
+
+        config.read(self.config_file)
+        self.old_version = config.get("Update", "version", fallback=None)
+        if config.has_section("Migrations"):
+            self.applied_migrations = set(config.options("Migrations"))
+        try:
+            self.check_interval = config.getfloat("Update", "check_interval", fallback=DEFAULT_CHECK_INTERVAL)
+        except ValueError:
+            self.check_interval = DEFAULT_CHECK_INTERVAL
+
+    def get_latest_release(self):
+        """
+        Fetches the latest release from GitHub and returns the tag and the executable asset
+        (a dict with its "browser_download_url", "size" and "digest").
+        The delta patch from the current version, if the release has one, is kept in self.patch_asset.
+        """
+        self.patch_asset = None
+        try:
+            releases = self.releases.get_json(f"{self.github_releases_api_url}?per_page=1")
+
+            if not releases:
+                print("No releases found.")
+                return None, None
+
+            latest_release = releases[0]
+            tag_name = latest_release["tag_name"]
+            self.releases.remember_notes(latest_release)
+
+            assets = {asset["name"]: asset for asset in latest_release.get("assets", [])}
+            if self.executable_name in assets:
+                self.patch_asset = assets.get(self.patch_name)
+                return tag_name, assets[self.executable_name]
+
+            print(f"Executable {self.executable_name} not found in the latest release.")
+            return None, None
+        except requests.RequestException as e:
+            print(f"Error fetching release information: {e}")
+            return None, None
+
+    def is_update_required(self, latest_version):
+        """
+        Compares the current version with the latest version using numeric conversion.
+        """
+        print(f"Current version: {self.current_version}")
+        print(f"Latest version: {latest_version}")
+        try:
+            current_num = version_to_number(self.current_version)
+            latest_num = version_to_number(latest_version)
+            return current_num != latest_num
+        except ValueError as e:
+            print(f"Error comparing versions: {e}")
+            return False
+
+    def download_executable(self, asset, output_path, progress=None):
+        """
+        Downloads the executable asset and saves it to output_path.
+        The download goes to output_path.<asset id>.part first and is resumed from there if the connection
+        drops, even across launches: the asset id ties the partial file to one release.
+        The file is only moved to output_path once its size and digest match the release asset's.
+        :param progress: Called as progress(downloaded, total) in bytes
+        """
+        part_path = f"{output_path}.{asset['id']}.part" if asset.get("id") is not None else output_path + ".part"
+        for leftover in glob.glob(glob.escape(output_path) + ".*part"):
+            asset_id = leftover[len(output_path):-len(".part")].lstrip(".")
+            if leftover != part_path and (not asset_id or asset_id.isdigit()):  # Partial download of another release
+                os.remove(leftover)
+        expected_size = asset.get("size")
+        print(f"Downloading {asset.get('name', self.executable_name)}...")
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                self._download_part(asset["browser_download_url"], part_path, expected_size, progress)
+                break
+            except (requests.RequestException, OSError) as e:
+                print(f"Error downloading the executable: {e}")
+                if attempt == DOWNLOAD_RETRIES:
+                    return False
+                time.sleep(min(2 ** attempt, 10))
+
+        if not self._verify_download(part_path, asset):
+            os.remove(part_path)
+            return False
+        os.replace(part_path, output_path)
+        print(f"{asset.get('name', self.executable_name)} downloaded successfully as {output_path}.")
+        return True
+
+    def download_update(self, asset, output_path, current_executable_path, progress=None):
+        """
+        Builds the new executable at output_path from the delta patch of the current version when the
+        release has one, and falls back to downloading the whole executable otherwise.
+        """
+        if self.patch_asset and self.apply_delta(asset, output_path, current_executable_path):
+            return True
+        return self.download_executable(asset, output_path, progress)
+
+    def apply_delta(self, asset, output_path, current_executable_path):
+        """Download self.patch_asset and apply it to the current executable. Returns False on any failure."""
+        patch_path = output_path + ".delta"
+        part_path = output_path + ".part"
+        try:
+            if not self.download_executable(self.patch_asset, patch_path):
+                return False
+            with open(current_executable_path, "rb") as file:
+                current = file.read()
+            with open(patch_path, "rb") as file:
+                patch = file.read()
+            with open(part_path, "wb") as file:
+                file.write(apply_patch(current, patch))
+
+            if not self._verify_download(part_path, asset):
+                os.remove(part_path)
+                return False
+            os.replace(part_path, output_path)
+            print(f"{self.executable_name} patched from {self.current_version} ({len(patch)} bytes downloaded).")
+            return True
+        except (PatchError, OSError, requests.RequestException) as e:
+            print(f"Couldn't apply the update patch ({e}), downloading the full executable instead.")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            return False
+        finally:
+            if os.path.exists(patch_path):
+                os.remove(patch_path)
+
+    def _download_part(self, url, part_path, expected_size, progress=None):
+        """Download `url` into `part_path`, continuing from what it already contains."""
+        downloaded = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if expected_size is not None and downloaded >= expected_size:
+            if downloaded == expected_size:
+                return
+            downloaded = 0  # Leftover of another version
+
+        headers = {"Accept": "application/octet-stream"}
+        if downloaded:
+            headers["Range"] = f"bytes={downloaded}-"
+        with self.session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code == 416:  # Nothing left to download, or a wrong range: start over
+                downloaded = 0
+                open(part_path, "wb").close()
+                return self._download_part(url, part_path, expected_size, progress)
+            response.raise_for_status()
+            if response.status_code != 206:
+                downloaded = 0  # The server ignored the range
+            elif downloaded:
+                print(f"Resuming the download at {downloaded} bytes")
+            total = expected_size or downloaded + int(response.headers.get("Content-Length", 0))
+
+            chunk_size = MIN_CHUNK_SIZE
+            with open(part_path, "ab" if downloaded else "wb") as file:
+                while True:
+                    started = time.monotonic()
+                    chunk = self._read(response, chunk_size)
+                    if not chunk:
+                        break
+                    file.write(chunk)
+                    downloaded += len(chunk)
+                    if progress:
+                        progress(downloaded, total)
+
+                    # Aim for roughly one read every 0.1 to 0.5 s
+                    elapsed = time.monotonic() - started
+                    if elapsed < 0.1 and len(chunk) == chunk_size:
+                        chunk_size = min(chunk_size * 2, MAX_CHUNK_SIZE)
+                    elif elapsed > 0.5:
+                        chunk_size = max(chunk_size // 2, MIN_CHUNK_SIZE)
+
+        if expected_size is not None and downloaded < expected_size:
+            raise requests.RequestException(f"connection closed after {downloaded} of {expected_size} bytes")
+
+    @staticmethod
+    def _read(response, size) -> bytes:
+        """
+        Read the next `size` bytes of a streamed response. urllib3 errors of a dropped connection
+        are raised as requests exceptions, like iter_content does, so the download is retried.
+        """
+        try:
+            return response.raw.read(size, decode_content=True)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.ConnectionError(e)
+        except urllib3.exceptions.HTTPError as e:  # ProtocolError (connection reset), DecodeError...
+            raise requests.exceptions.ChunkedEncodingError(e)
+
+    def _verify_download(self, path, asset) -> bool:
+        """Check a downloaded file against the size and "algorithm:hash" digest of its release asset."""
+        size = os.path.getsize(path)
+        if asset.get("size") is not None and size != asset["size"]:
+            print(f"Downloaded file has {size} bytes instead of {asset['size']}, discarding it.")
+            return False
+
+        digest = asset.get("digest")
+        if not digest:
+            print("[WARN] The release doesn't publish a digest, only the size of the download was checked.")
+            return True
+        algorithm, _, expected = digest.partition(":")
+        try:
+            actual = hash_file(path, algorithm)
+        except ValueError:
+            print(f"[WARN] Unknown digest algorithm {algorithm}, only the size of the download was checked.")
+            return True
+        if actual != expected.lower():
+            print(f"Downloaded file {algorithm} is {actual} instead of {expected}, discarding it.")
+            return False
+        return True
+
+    def update_config_version(self, version, applied_migrations=()):
+        """
+        Writes the downloaded version to the configuration file under the "Update" section,
+        and the migrations that were just applied under the "Migrations" section.
+        """
+        config = configparser.ConfigParser()
+        if os.path.exists(self.config_file):
+            config.read(self.config_file)
+        if "Update" not in config:
+            config["Update"] = {}
+        config["Update"]["version"] = version
+        if applied_migrations:
+            if "Migrations" not in config:
+                config["Migrations"] = {}
+            for migration_version in applied_migrations:
+                config["Migrations"][migration_version] = version
+        with open(self.config_file, "w") as configfile:
+            config.write(configfile)
+        print(f"Config file updated: [Update] version = {version}")
+
+    @staticmethod
+    def replace(temp_executable_path, current_executable_path):
+        """
+        Creates and executes a batch script that waits for the current launcher process to exit,
+        replaces the old executable with the new one.
+        """
+        try:
+            batch_script = f"""@echo off
+            :check_file
+            if exist "{temp_executable_path}" (
+                timeout /t 1 >nul
+                move /y "{temp_executable_path}" "{current_executable_path}"
+            ) else (
+                goto end
+            )
+            goto check_file
+
+            :end
+            del "%~f0"
+            exit
+            """
+
+            batch_file = "update_launcher.bat"
+
+            # Write the batch script to a file
+            with open(batch_file, "w") as file:
+                file.write(batch_script)
+
+            # Run the batch file
+            subprocess.Popen([batch_file], shell=True)
+            print("Update batch script started.")
+            sys.exit(0)  # Exit the current program
+        except Exception as e:
+            print(f"Error during replacement: {e}")
+
+    @staticmethod
+    def _print_progress():
+        """Progress callback printing every 10% of the download."""
+        last = [-1]
+
+        def progress(downloaded, total):
+            if total:
+                tenth = downloaded * 10 // total
+                if tenth != last[0]:
+                    last[0] = tenth
+                    print(f"Downloaded {downloaded * 100 // total}% ({downloaded} / {total} bytes)")
+        return progress
+
+    def updated(self):
+        """
+        Checks the configuration file to verify if the launcher version has changed.
+        Returns True if the version in the config file differs from the current version.
+        """
+        if self.old_version is None:
+            return False
+
+        if self.old_version != self.current_version:
+            print("Launcher version has been updated according to the config file.")
+            return True
+        return False
+
+    def _get_release_notes(self, tag_name: str) -> str:
+        """
+        Returns the release‑notes body for the given tag
+        (empty string on failure).
+        Notes are cached, so the changelog also shows up offline.
+        """
+        if self.releases.notes.get(tag_name):
+            return self.releases.notes[tag_name]
+        url = f"{self.github_releases_api_url}/tags/{tag_name}"
+        try:
+            release = self.releases.get_json(url)
+            self.releases.remember_notes(release)
+            return release.get("body") or ""
+        except (requests.RequestException, KeyError, AttributeError):
+            return ""
+
+    def show_changelog(self, tag_name: str):
+        """Prints the release notes of *tag_name*."""
+        notes = self._get_release_notes(tag_name)
+        if notes:
+            print(f"Changelog — {tag_name}\n{textwrap.dedent(notes).strip()}")
+
+    def do_on_update(self):
+        applied = []
+        if self.updated():
+            self.show_changelog(self.current_version)
+
+            old_version = version_to_number(self.old_version)
+            pending = [migration for migration in MIGRATIONS
+                       if old_version < version_to_number(migration.version)
+                       and migration.version not in self.applied_migrations]
+            if pending:
+                apply_migrations(pending, self)
+                applied = [migration.version for migration in pending]
+
+        self.update_config_version(self.current_version, applied)
@@ -1,13 +1,14 @@
 import customtkinter as ctk
 from launcher_settings import LauncherSettings
 from old_patch import OldPatch
-from mods import Mod, LWMod, DisplayMod
-from bindings import Binding
+from mods import LWMod, DisplayMod
+from bindings import BindingsWindow
 from settings import DisplaySetting
-import subprocess
-from widgets import CustomRadioButtons, CustomTopLevel
+from core import game
+from core.files import File
+from widgets import CustomRadioButtons, CustomTopLevel, show_error
 from ui import colors, fonts
-from paths import *
+from core.paths import OL2_ICON
 import tkinter as tk
 
 
@@ -34,10 +35,6 @@ class Launcher:
         self.old_patch = OldPatch()
         self.version = current_version
 
-        self.mod_loader = Mod("ModLoader",
-                              source_path=os.path.join(MODS_PATH, "ModLoader"),
-                              install_path=os.path.join(GAME_DIRECTORY, "Binaries", "Win64"))
-
         self.create_radio_buttons()
         self.create_launch_button()
         self.create_config_buttons()
@@ -118,10 +115,10 @@ class Launcher:
         self.root.after(100, lambda: self.root.attributes("-topmost", False))
 
     def open_bindings_window(self):
-        if Binding.window is None:
-            Binding.window = CustomTopLevel(self.root, "Configure Bindings", 560, 600)
-            Binding.lift_launcher = self.lift_launcher
-            Binding.show_window()
+        if BindingsWindow.window is None:
+            BindingsWindow.window = CustomTopLevel(self.root, "Configure Bindings", 560, 600)
+            BindingsWindow.lift_launcher = self.lift_launcher
+            BindingsWindow.show_window()
 
     def open_settings_window(self):
         settings_window = CustomTopLevel(self.root, "Option and Mods", 560, 666)
@@ -139,13 +136,12 @@ class Launcher:
 
     def launch_game(self):
         patch = self.patch_selector.selected_value
-        LWMod.prepare_launch()
+        # Config edits of all the mods are written once, before the game starts
+        with File.batch():
+            LWMod.prepare_launch()
         if patch == "Latest Patch":
-            self.mod_loader.install()
             try:
-                # Launch the batch file
-                subprocess.Popen(os.path.join(GAME_DIRECTORY, "Binaries", "Win64", "Outlast2.exe"), shell=True)
-                print("Launching Outlast II...")
+                game.launch_latest_patch()
             except Exception as e:
                 show_error(f"Error launching Outlast II: {e}")
         elif patch == "Old Patch":
@@ -1,4 +1,4 @@
-from paths import CONFIG_FILE
+from core.paths import CONFIG_FILE
 import configparser
 import customtkinter as ctk
 from ui import fonts, colors  # Using provided fonts and colors
@@ -1,31 +1,48 @@
-import os
-from paths import GAME_DIRECTORY, MODS_PATH
-from files import File
-from bindings import DoubleBind, MiscBinding, SpeedrunHelperBinding, FPSBinding, OptionalBinding, DevConsoleBinding
-from settings import Setting, DisplaySetting
-from mods import LWMod, DisplayMod
-from updates import LauncherUpdater
-from os import path
-from launcher import Launcher
+import profiler  # First, so it can time the other imports
+import sys
+import cli
+from profiler import phase
+
+# Command line launch, before anything related to the window is imported
+args = cli.parse_args()
+if args.launch:
+    with phase("command line launch"):
+        launched = cli.launch(args.launch, args.mods)
+    if args.close:
+        sys.exit(0 if launched else 1)
+
+with phase("imports"):
+    import os
+    from core import paths, game
+    from core.paths import GAME_DIRECTORY, mod_source
+    from core.errors import set_error_handler
+    from core.files import File
+    from core.bindings import (Binding, DoubleBind, SpeedrunHelperBinding, FPSBinding, OptionalBinding,
+                               DevConsoleBinding)
+    from settings import DisplaySetting
+    from mods import DisplayMod
+    from updates import LauncherUpdater
+    from widgets import show_error
+    from os import path
+    from launcher import Launcher
 
 CURRENT_VERSION = "1.3.4"
 
-# Files
-default_game = File(path.join(GAME_DIRECTORY, "OLGame", "Config", "DefaultGame.ini"))
-stamina_off = Setting("StaminaOff",
-                      file=default_game,
-                      setting="StaminaMaxStamina=",
-                      enabled_value="-1", disabled_value="100")
-sprint_delay_off = Setting("SprintDelayOff",
-                           file=default_game,
-                           setting="SprintDelay=",
-                           enabled_value="0", disabled_value="2")
-LWMod.sprint_delay = Setting("SprintDelay",
-                          file=default_game,
-                          setting="SprintDelay=",
-                          enabled_value="2", disabled_value="0")
+set_error_handler(show_error)
+with phase("paths.init"):
+    found = paths.init()
+if not found:
+    sys.exit(1)
 
 # Bindings
+with phase("Binding.init"):
+    Binding.init()
+
+# Config files, mods selected at launch, and the mod loader
+with phase("game.setup"):
+    game.setup()
+default_system_settings = game.config_file("DefaultSystemSettings")
+
 DoubleBind()
 
 SpeedrunHelperBinding(command="BOL FreeCam", description="Toggle Freecam")
@@ -35,7 +52,8 @@ SpeedrunHelperBinding(command="BOL ShowPlayerInfo", description="Show Player Inf
 SpeedrunHelperBinding(command="BOL ShowGameplayElements", description="Show Gameplay Elements")
 
 
-FPSBinding.load_fps_values()
+with phase("FPSBinding.load_fps_values"):
+    FPSBinding.load_fps_values()
 
 OptionalBinding.default_bindings += [
     ("Set OLGame DifficultyMode EDMO_Insane", "Set Difficulty to Insane"),
@@ -49,47 +67,39 @@ OptionalBinding.default_bindings += [
     ("nxvis collision", "Show Collision"),
 ]
 
-OptionalBinding.load_optional_bindings()
-DevConsoleBinding.enable_console()
+with phase("OptionalBinding.load_optional_bindings"):
+    OptionalBinding.load_optional_bindings()
+with phase("DevConsoleBinding.enable_console"):
+    DevConsoleBinding.enable_console()
 
 # Settings
 Steam = DisplaySetting("Launch with Steam",
-                       File(path.join(GAME_DIRECTORY, "OLGame", "Config", "DefaultEngine.ini")),
+                       game.config_file("DefaultEngine"),
                        "bRelaunchInSteam=",
                        tooltip_text="Launches the game with Steam.\n"
                                     "Disabled is recommended.")
 Vsync = DisplaySetting("Vsync",
-                       File(path.join(GAME_DIRECTORY, "OLGame", "Config", "DefaultSystemSettings.ini")),
+                       default_system_settings,
                        "SyncInterval=", enabled_value="1", disabled_value="0",
                        tooltip_text="Enabling Vsync renders max framerate changes impossible.\n"
                                     "Disabled is recommended")
 Borderless = DisplaySetting("Borderless Windowed",
-                            File(path.join(GAME_DIRECTORY, "OLGame", "Config", "DefaultSystemSettings.ini")),
+                            default_system_settings,
                             "UseBorderlessFullscreen=",
                             tooltip_text="Enables Borderless Windowed.\n"
                                          "Recommended for less laggy alt tabs and to see your livesplit.")
 bPause = DisplaySetting("Pause on Loss of Focus",
-                        File(path.join(GAME_DIRECTORY, "Engine", "Config", "BaseEngine.ini")),
+                        game.config_file("BaseEngine"),
                         "bPauseOnLossOfFocus=",
                         tooltip_text="If disabled, game will not be paused during alt tabs.")
 MouseSmoothing = DisplaySetting("Mouse Smoothing",
-                                File(path.join(GAME_DIRECTORY, "Engine", "Config", "BaseInput.ini")),
+                                game.config_file("BaseInput"),
                                 "bEnableMouseSmoothing=",
                                 tooltip_text="Changes how the mouse input is processed. Normally enabled by default")
 
 
-NoCPK = LWMod("No CPK",
-              source_path=path.join(MODS_PATH, "No CPK"), install_path=path.join(GAME_DIRECTORY, "Mods"))
-
-NoStamina = LWMod("No Stamina",
-                  "", "",
-                  stamina_off, sprint_delay_off)
-
-CutsceneSkip = LWMod("Cutscene Skip",
-                     source_path=path.join(MODS_PATH, "Cutscene Skip"), install_path=path.join(GAME_DIRECTORY, "Mods"))
-
 SpeedrunHelper = DisplayMod("Speedrun Helper",
-                            source_path=path.join(MODS_PATH, "Speedrun Helper"), install_path=path.join(GAME_DIRECTORY, "Mods"),
+                            source_path=mod_source("Speedrun Helper"), install_path=path.join(GAME_DIRECTORY, "Mods"),
                             tooltip_text="Speedrun Helper allows you to:\n"
                                          "Set Checkpoints with Ctrl + F1-F4, and TP to them with F1-F4.\n"
                                          "Use the commands Toggle Freecam, TP to Free, GodMode,\n ShowPlayerInfo and Show Gameplay Elements.\n"
@@ -97,36 +107,45 @@ SpeedrunHelper = DisplayMod("Speedrun Helper",
                             )
 
 
-CONFIG_FILE = "LauncherConfig.ini"
-
-
 # Check if it's the first time the Launcher has been launched
 def first_launch():
-    SpeedrunHelper.install()
-    Steam.disable()
-    Vsync.disable()
-    Borderless.enable()
-    bPause.disable()
-    with open(CONFIG_FILE, 'w') as f:
+    with File.batch():
+        SpeedrunHelper.install()
+        Steam.disable()
+        Vsync.disable()
+        Borderless.enable()
+        bPause.disable()
+    with open(paths.CONFIG_FILE, 'w') as f:
         f.write("")
 
 
-if not os.path.exists(CONFIG_FILE):
-    first_launch()
+if not os.path.exists(paths.CONFIG_FILE):
+    with phase("first launch"):
+        first_launch()
 
 GITHUB_RELEASES_API_URL = "https://api.github.com/repos/HayaiNeko/BetterOutlast2Launcher/releases"
 EXECUTABLE_NAME = "BetterOutlast2Launcher.exe"
 
 
-launcher = Launcher(CURRENT_VERSION)
+with phase("Launcher window"):
+    launcher = Launcher(CURRENT_VERSION)
 
 updater = LauncherUpdater(CURRENT_VERSION, GITHUB_RELEASES_API_URL, EXECUTABLE_NAME)
 updater.register("SpeedrunHelper", SpeedrunHelper)
 
+with phase("updates"):
+    updater.do_on_update()
+
+# The release check runs in the background, the prompt shows up once the launcher is open
 if launcher.launcher_settings.check_for_updates:
-    updater.check_and_update()
+    with phase("update check"):
+        updater.check_in_background(launcher.root)
 
-updater.do_on_update()
 
+if profiler.ENABLED:
+    def window_ready():
+        profiler.mark("window ready")
+        profiler.report()
+    launcher.root.after(0, window_ready)
 
 launcher.run()
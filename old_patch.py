@@ -2,72 +2,35 @@ import os
 import time
 import subprocess
 import threading
-import configparser
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
+import core.old_patch
 from ui import fonts, colors
 from widgets import show_error
-from files import File
-from settings import Setting
+from core.size_tracker import FolderSizeTracker
+from core.fs_watch import create_watcher, wait_for_path
+from core.download_stats import DownloadStats, format_size
+from core.depot_manifest import DepotManifest, CompletionCounter, MANIFEST_ALGORITHM, APP_ID, DEPOT_ID, MANIFEST_ID
+from core.hash_cache import HashCache
+from core.dedupe import Deduplicator
+from core.old_patch import STEAM_CONTENT_PATH
+from widgets import CustomAskYesNo
+from core.paths import GAME_DIRECTORY, OLD_PATCH_MANIFEST, OLD_PATCH_HASHES
 
-# Default Steam content folder path and IDs
-APP_ID = "414700"       # Outlast 2
-DEPOT_ID = "414701"     # Windows files depot
-MANIFEST_ID = "7085410466650398118"  # Manifest from 10 May 2017
-STEAM_CONTENT_PATH = rf"C:\Program Files (x86)\Steam\steamapps\content\app_{APP_ID}\depot_{DEPOT_ID}"
+EXPECTED_SIZE = 27096937514  # Size of the depot in bytes, when no manifest is bundled
+PROGRESS_INTERVAL = 0.25  # Minimum time between two progress updates, in seconds
+WATCH_TIMEOUT = 30        # Re-check the download even if no change was notified, in seconds
 
 
-class OldPatch:
-    CONFIG_SECTION = "OldPatch"
-
-    def __init__(self):
-        # Open the config file
-        self.config_file = "LauncherConfig.ini"
-        self.config = configparser.ConfigParser()
-        self.config.read(self.config_file)
-        if not self.config.has_section(OldPatch.CONFIG_SECTION):
-            self.config.add_section(OldPatch.CONFIG_SECTION)
-
-        # Load the saved path (default is empty)
-        self.path = self.config.get(OldPatch.CONFIG_SECTION, "Path", fallback="")
-        if not self.path:
-            self.detect_path()
-
-    def save_path(self):
-        self.config.set(OldPatch.CONFIG_SECTION, "Path", self.path)
-        with open(self.config_file, "w") as f:
-            self.config.write(f)
-        print(f"Old Patch path saved: {self.path}")
-
-    @staticmethod
-    def is_valid_old_patch(path):
-        """Checks if the provided path is structured like an OL2 folder."""
-        if path and os.path.isdir(path):
-            bat_file_path = os.path.join(path, "Outlast2.bat")
-            if not os.path.isfile(bat_file_path):
-                return False
-            required_dirs = ["OLGame", "BInaries", "Engine"]
-            for directory in required_dirs:
-                if not os.path.isdir(os.path.join(path, directory)):
-                    return False
-            return True
-        return False
-
-    def detect_path(self):
-        """Detects the old patch path in the default downloading spot"""
-        # Supposons que le répertoire courant est "steamapps/common/Outlast 2"
-        steamapps_dir = os.path.abspath(os.path.join(os.getcwd(), "../.."))
-        patch_path = os.path.join(steamapps_dir, "content", f"app_{APP_ID}", f"depot_{DEPOT_ID}")
-
-        self.path = patch_path if self.is_valid_old_patch(patch_path) else ""
-        self.save_path()
+class OldPatch(core.old_patch.OldPatch):
+    """Old Patch management window: download tracking, verification and shared files."""
 
     def install_manage(self):
         """Open a Toplevel window for selecting or downloading the Old Patch."""
         self.window = ctk.CTkToplevel(fg_color=colors["background"])
         self.window.title("Old Patch Management")
         self.window.attributes("-topmost", True)
-        self.window.geometry("600x400")  # Enlarged window
+        self.window.geometry("600x680")  # Enlarged window
 
         # Title and current path display
         title = ctk.CTkLabel(self.window, text="Select your Old Patch Folder",
@@ -125,9 +88,54 @@ class OldPatch:
         self.progress_bar.set(0)
         self.progress_bar.pack(fill="x", padx=20, pady=5)
 
+        # Files can only be verified against a bundled manifest of the depot
+        self.manifest = DepotManifest.load(OLD_PATCH_MANIFEST)
+        if self.manifest:
+            self.verify_button = ctk.CTkButton(
+                self.window,
+                text="🔍 Verify Old Patch Files",
+                command=self.start_verification,
+                font=fonts["text"],
+                fg_color=colors["primary"],
+                hover_color=colors["primary hover"],
+                text_color=colors["text"]
+            )
+            self.verify_button.pack(pady=(15, 5))
+
+            self.verify_label = ctk.CTkLabel(self.window, text="", font=fonts["small"], text_color=colors["text"])
+            self.verify_label.pack(pady=5)
+
+        # Disk space section
+        dedupe_frame = ctk.CTkFrame(self.window, fg_color="transparent")
+        dedupe_frame.pack(pady=(15, 5))
+        self.dedupe_buttons = {}
+        for key, text, command in (("scan", "💾 Find Shared Files", self.start_dedupe_scan),
+                                   ("link", "🔗 Link Shared Files", self.link_shared_files),
+                                   ("restore", "↩ Restore Full Copy", self.start_dedupe_restore)):
+            button = ctk.CTkButton(
+                dedupe_frame,
+                text=text,
+                command=command,
+                font=fonts["text"],
+                fg_color=colors["primary"],
+                hover_color=colors["primary hover"],
+                text_color=colors["text"]
+            )
+            button.pack(side="left", padx=5)
+            self.dedupe_buttons[key] = button
+        self.dedupe_buttons["link"].configure(state="disabled")
+        self.shared_files = []
+
+        self.dedupe_label = ctk.CTkLabel(self.window, text="", font=fonts["small"], text_color=colors["text"])
+        self.dedupe_label.pack(pady=5)
+
         self.window.update_idletasks()
         threading.Thread(target=self.track_download, daemon=True).start()
 
+    def _in_ui(self, function, *args, **kwargs):
+        """Call a widget method from a worker thread: it runs on the Tk thread, as Tk isn't thread-safe."""
+        self.window.after(0, lambda: function(*args, **kwargs))
+
     def select_folder(self, master):
         folder_selected = filedialog.askdirectory(title="Select Old Patch Folder", parent=master)
         if folder_selected:
@@ -148,41 +156,198 @@ class OldPatch:
         self.copy_steam_command_button.configure(text="✅ Command Copied")
 
     def track_download(self):
-        expected_size = 27096937514  # Expected size in bytes
+        manifest = self.manifest
+        expected_size = manifest.total_size if manifest else EXPECTED_SIZE
         expected_size_gb = expected_size / (1024 ** 3)
-        while not os.path.exists(STEAM_CONTENT_PATH):
-            self.progress_label.configure(text="📥 Waiting for download to start...", text_color="orange")
-            time.sleep(1)
+        if not os.path.exists(STEAM_CONTENT_PATH):
+            self._in_ui(self.progress_label.configure, text="📥 Waiting for download to start...", text_color="orange")
+            wait_for_path(STEAM_CONTENT_PATH)
+
+        tracker = FolderSizeTracker(STEAM_CONTENT_PATH)
+        watcher = create_watcher(STEAM_CONTENT_PATH)
+        counter = CompletionCounter(manifest, STEAM_CONTENT_PATH) if manifest else None
+        stats = DownloadStats(expected_size)
         try:
+            changed = None
+            total_size = tracker.update()
             while True:
-                total_size = self.get_folder_size(STEAM_CONTENT_PATH)
+                stats.add_sample(total_size)
                 progress = min(100.0, (total_size / expected_size) * 100)
-                self.progress_label.configure(
-                    text=f"📥 Progress: {progress:.2f}% ({total_size / (1024 ** 3):.2f} GB / {expected_size_gb:.2f} GB)",
-                    text_color=colors["text"]
+                details = stats.describe()
+                if counter:
+                    complete_files = counter.update(tracker.file_size, changed)
+                    details += f"\n{complete_files}/{len(manifest.files)} files complete"
+                    complete = complete_files == len(manifest.files)
+                else:
+                    complete = total_size >= expected_size
+
+                self._in_ui(
+                    self.progress_label.configure,
+                    text=f"📥 Progress: {progress:.2f}% ({total_size / (1024 ** 3):.2f} GB / {expected_size_gb:.2f} GB)\n"
+                         f"{details}",
+                    text_color="orange" if stats.stalled_for() else colors["text"]
                 )
-                self.progress_bar.set(progress / 100)
-                if total_size >= expected_size:
+                self._in_ui(self.progress_bar.set, progress / 100)
+                if complete:
                     if not self.path:
-                        self.progress_label.configure(text="✅ Download complete!", text_color="green")
+                        self._in_ui(self.progress_label.configure, text="✅ Download complete!", text_color="green")
                         self.path = STEAM_CONTENT_PATH
                         self.save_path()
                         break
-                time.sleep(1)
+
+                # Let writes pile up a little, then only look at what changed.
+                # A timeout falls back to a regular update, in case a notification was missed
+                time.sleep(PROGRESS_INTERVAL)
+                changed = watcher.wait(timeout=WATCH_TIMEOUT) or None
+                total_size = tracker.update(changed)
         except Exception as e:
             print(e)
+        finally:
+            watcher.close()
 
-    @staticmethod
-    def get_folder_size(path):
-        total = 0
-        for dirpath, _, filenames in os.walk(path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                try:
-                    total += os.path.getsize(fp)
-                except Exception as e:
-                    print(f"Error on {fp}: {e}")
-        return total
+    def start_verification(self):
+        if not self.path:
+            show_error("No Old Patch folder is defined.")
+            return
+        self.verify_button.configure(state="disabled")
+        threading.Thread(target=self.verify_files, args=(self.manifest,), daemon=True).start()
+
+    def verify_files(self, manifest):
+        """Check every Old Patch file against the depot manifest, and show which ones are damaged."""
+        def progress(done, total, rel_path):
+            self._in_ui(
+                self.verify_label.configure,
+                text=f"🔍 Verifying: {done / total * 100 if total else 100:.1f}% "
+                     f"({format_size(done)} / {format_size(total)})\n{rel_path}",
+                text_color=colors["text"]
+            )
+
+        try:
+            hash_cache = HashCache(OLD_PATCH_HASHES, algorithm=MANIFEST_ALGORITHM)
+            problems = manifest.verify(self.path, hash_cache, progress)
+        except Exception as e:
+            print(f"[ERROR] Old Patch verification failed: {e}")
+            self._in_ui(self.verify_label.configure, text=f"❌ Verification failed: {e}", text_color="red")
+            return
+        finally:
+            self._in_ui(self.verify_button.configure, state="normal")
+
+        if not problems:
+            print(f"[INFO] All {len(manifest.files)} Old Patch files are valid")
+            self._in_ui(self.verify_label.configure, text=f"✅ All {len(manifest.files)} files are valid",
+                        text_color="green")
+            return
+
+        for rel_path, problem in sorted(problems.items()):
+            print(f"[WARN] {rel_path}: {problem}")
+        shown = "\n".join(f"{rel_path}: {problem}" for rel_path, problem in sorted(problems.items())[:5])
+        more = f"\n... and {len(problems) - 5} more" if len(problems) > 5 else ""
+        self._in_ui(
+            self.verify_label.configure,
+            text=f"❌ {len(problems)} damaged files, download the depot again to repair them:\n{shown}{more}",
+            text_color="red"
+        )
+
+    def _deduplicator(self):
+        hash_cache = HashCache(OLD_PATCH_HASHES, algorithm=MANIFEST_ALGORITHM)
+        return Deduplicator(self.path, GAME_DIRECTORY, hash_cache)
+
+    def _run_dedupe_task(self, task):
+        """Run a disk space task in the background, with the disk space buttons disabled."""
+        if not self.path:
+            show_error("No Old Patch folder is defined.")
+            return
+        for button in self.dedupe_buttons.values():
+            button.configure(state="disabled")
+
+        def enable_buttons():
+            self.dedupe_buttons["scan"].configure(state="normal")
+            self.dedupe_buttons["restore"].configure(state="normal")
+            if self.shared_files:
+                self.dedupe_buttons["link"].configure(state="normal")
+
+        def run():
+            try:
+                task(self._deduplicator())
+            except Exception as e:
+                print(f"[ERROR] {e}")
+                self._in_ui(self.dedupe_label.configure, text=f"❌ {e}", text_color="red")
+            finally:
+                self._in_ui(enable_buttons)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def start_dedupe_scan(self):
+        self._run_dedupe_task(self.find_shared_files)
+
+    def find_shared_files(self, deduplicator):
+        """Hash the Old Patch and the current install, and show how much space linking would free."""
+        def progress(done, total):
+            self._in_ui(
+                self.dedupe_label.configure,
+                text=f"💾 Comparing files: {format_size(done)} / {format_size(total)}", text_color=colors["text"])
+
+        shared = deduplicator.scan(progress)
+        self.shared_files = [item for item in shared if not item.linked]
+        shared_size = sum(item.size for item in self.shared_files)
+        linked_size = sum(item.size for item in shared if item.linked)
+        print(f"[INFO] {len(self.shared_files)} Old Patch files ({format_size(shared_size)}) are identical "
+              f"to the current install, {format_size(linked_size)} already linked")
+        self._in_ui(
+            self.dedupe_label.configure,
+            text=f"💾 {len(self.shared_files)} files ({format_size(shared_size)}) can be shared with the current install"
+                 f"\n{format_size(linked_size)} already shared",
+            text_color=colors["text"])
+
+    def link_shared_files(self):
+        shared_size = sum(item.size for item in self.shared_files)
+        allow_hardlinks = not self._deduplicator().supports_clones()
+        if not allow_hardlinks:
+            question = (f"Replace {len(self.shared_files)} Old Patch files with copy-on-write clones of the "
+                        f"current install, freeing {format_size(shared_size)}?\n"
+                        "You can restore full copies at any time.")
+        else:
+            question = (f"This drive can't clone files (only ReFS and Dev Drives can).\n"
+                        f"{len(self.shared_files)} Old Patch files ({format_size(shared_size)}) can be hardlinked "
+                        "to the current install instead, but both installs then share the same data: "
+                        "if Steam updates one of these files in place, the Old Patch copy changes too "
+                        "and has to be downloaded again.\n"
+                        "Hardlink the files anyway? You can restore full copies at any time.")
+        if not CustomAskYesNo.askyesno("Link Shared Files", question, parent=self.window):
+            return
+
+        def link(deduplicator):
+            def progress(done, total, rel_path):
+                self._in_ui(self.dedupe_label.configure, text=f"🔗 Linking {done}/{total}\n{rel_path}",
+                            text_color=colors["text"])
+
+            freed = deduplicator.link(self.shared_files, progress, allow_hardlinks)
+            self.shared_files = []
+            print(f"[INFO] Old Patch files linked, {format_size(freed)} freed")
+            self._in_ui(self.dedupe_label.configure, text=f"✅ {format_size(freed)} freed", text_color="green")
+
+        self._run_dedupe_task(link)
+
+    def start_dedupe_restore(self):
+        self._run_dedupe_task(self.restore_full_copy)
+
+    def restore_full_copy(self, deduplicator):
+        """Give every linked Old Patch file its own copy again."""
+        def progress(done, total, rel_path):
+            self._in_ui(self.dedupe_label.configure, text=f"↩ Restoring {done}/{total}\n{rel_path}",
+                        text_color=colors["text"])
+
+        damaged = deduplicator.restore(progress)
+        self.shared_files = []
+        if damaged:
+            for rel_path in damaged:
+                print(f"[WARN] {rel_path} changed while it was linked")
+            self._in_ui(
+                self.dedupe_label.configure,
+                text=f"⚠ Full copy restored, but {len(damaged)} files changed while linked: "
+                     f"download the depot again to repair them", text_color="orange")
+        else:
+            self._in_ui(self.dedupe_label.configure, text="✅ Full copy restored", text_color="green")
 
     def create_button(self, parent):
         """
@@ -204,20 +369,10 @@ class OldPatch:
         Checks if the current Old Patch folder is non-empty and valid.
         If valid, triggers the launch procedure by executing the Outlast2.bat file.
         """
-        if self.path and self.is_valid_old_patch(self.path):
-            File.demo_directory = self.path
-            File.sync_all_with_old_patch()
-            demo_steam = Setting(name="Demo Steam",
-                                 file=File(os.path.join(self.path, "OLGame", "Config", "DefaultEngine.ini"), demo_file=True),
-                                 setting="bRelaunchInSteam=")
-            demo_steam.disable()
-
+        if self.is_ready():
             try:
-                # Launch the batch file
-                subprocess.Popen(os.path.join(self.path, "Binaries", "Win64", "Outlast2.exe"))
-                print("Old Patch launched successfully.")
+                self.launch()
             except Exception as e:
                 show_error(f"Error launching Old Patch:{e}")
         else:
             self.install_manage()
-
@@ -0,0 +1,125 @@
+# Startup profiler, enabled with the BOL_PROFILE environment variable or the --profile argument.
+# Import it before anything else: it times every module imported after it, and the phases wrapped in
+# `with phase("name"):`. The report is printed and saved to LauncherProfile.json when report() is called.
+import os
+import sys
+import json
+import time
+import atexit
+from contextlib import contextmanager
+
+ENABLED = bool(os.environ.get("BOL_PROFILE")) or "--profile" in sys.argv
+REPORT_FILE = "LauncherProfile.json"
+TOP_IMPORTS = 15  # Slowest imports shown in the printed report
+
+_start = time.perf_counter()
+_phases = []     # [name, depth, start, duration]
+_imports = {}    # Module name -> [total time, time spent in the module itself]
+_stack = []      # Imports being executed, to subtract nested imports from their parent
+_depth = 0
+_reported = False
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block of code as a named phase. Costs nothing when profiling is disabled."""
+    global _depth
+    if not ENABLED:
+        yield
+        return
+    entry = [name, _depth, time.perf_counter() - _start, None]
+    _phases.append(entry)
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+        entry[3] = time.perf_counter() - _start - entry[2]
+
+
+def mark(name: str):
+    """Record an instant, e.g. when the window is first shown."""
+    if ENABLED:
+        _phases.append([name, _depth, time.perf_counter() - _start, 0.0])
+
+
+class _TimingLoader:
+    """Wraps a module loader to time the execution of the module."""
+
+    def __init__(self, loader, name: str):
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        _stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = _stack.pop()
+            if _stack:
+                _stack[-1] += elapsed
+            _imports[self._name] = [elapsed, elapsed - nested]
+
+
+class _TimingFinder:
+    """Meta path entry finding modules through the other finders, and wrapping their loaders."""
+
+    @classmethod
+    def find_spec(cls, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is cls or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader, fullname)
+                return spec
+        return None
+
+
+def _table() -> str:
+    lines = ["", "Startup profile (ms)", f"{'phase':<50}{'start':>10}{'duration':>10}"]
+    for name, depth, start, duration in _phases:
+        shown = "" if duration is None else f"{duration * 1000:.1f}"
+        lines.append(f"{'  ' * depth + name:<50}{start * 1000:>10.1f}{shown:>10}")
+
+    lines.append(f"\n{'slowest imports':<50}{'total':>10}{'self':>10}")
+    slowest = sorted(_imports.items(), key=lambda item: item[1][1], reverse=True)[:TOP_IMPORTS]
+    for name, (total, own) in slowest:
+        lines.append(f"{name:<50}{total * 1000:>10.1f}{own * 1000:>10.1f}")
+    lines.append(f"{'all imports':<50}{sum(own for _, own in _imports.values()) * 1000:>10.1f}")
+    return "\n".join(lines)
+
+
+def report():
+    """Print the profile and save it as JSON, once."""
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    data = {
+        "total": time.perf_counter() - _start,
+        "phases": [{"name": name, "depth": depth, "start": start, "duration": duration}
+                   for name, depth, start, duration in _phases],
+        "imports": {name: {"total": total, "self": own} for name, (total, own) in _imports.items()},
+    }
+    try:
+        with open(REPORT_FILE, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1)
+    except OSError as e:
+        print(f"[WARN] Couldn't save the startup profile: {e}")
+    print(_table())
+    print(f"[INFO] Startup profile saved to {os.path.abspath(REPORT_FILE)}")
+
+
+if ENABLED:
+    sys.meta_path.insert(0, _TimingFinder)
+    atexit.register(report)
@@ -1,50 +1,9 @@
 from ui import fonts, colors
 import customtkinter as ctk
-from files import File
+from core.settings import Setting
 from widgets import InfoIcon, InfoIconPlaceholder
 
 
-class Setting:
-    def __init__(self, name: str, file: File, setting: str, enabled_value: str = "true", disabled_value: str = "false"):
-        assert setting[-1] == "=", "Setting format invalid"
-
-        self.name = name
-        self.file = file
-        self.setting = setting
-        self.enabled_value = enabled_value.lower()
-        self.disabled_value = disabled_value.lower()
-
-    def get_value(self):
-        """Récupère la valeur actuelle du paramètre dans le fichier."""
-        i, line = self.file.get_line(self.setting)
-        if i >= 0:
-            return line.split("=")[-1].strip().lower()
-        return None
-
-    def is_enabled(self):
-        """Vérifie si la valeur actuelle est celle correspondant à 'enabled'."""
-        value = self.get_value()
-        return value == self.enabled_value if value is not None else False
-
-    def toggle(self):
-        """Inverse la valeur actuelle entre enabled et disabled."""
-        i, line = self.file.get_line(self.setting)
-        if i >= 0:
-            current_value = self.get_value()
-            new_value = self.disabled_value if current_value == self.enabled_value else self.enabled_value
-            self.file.replace_index(f"{self.setting}{new_value}", i, line)
-            self.file.write_lines()
-
-    def enable(self):
-        """Active le paramètre si ce n'est pas déjà le cas."""
-        if not self.is_enabled():
-            self.toggle()
-
-    def disable(self):
-        if self.is_enabled():
-            self.toggle()
-
-
 class DisplaySetting(Setting):
     display_settings = []  # Liste spécifique pour les paramètres affichables
 